@@ -3,6 +3,10 @@ import json
 import os
 import base64
 import csv
+import functools
+import contextlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 # Ensure local imports resolve when running from repo root
@@ -14,6 +18,36 @@ import segmentation
 import cv2
 import numpy as np
 
+# Per-unit OpenCV calls run on small buffers from the shared worker pool (MainWindow._worker_pool), which already
+# keeps every core busy; OpenCV's own thread dispatch on top of that only adds overhead and oversubscription.
+# The setting is process-wide, so single whole-image calls on the GUI thread opt back in with _cv_all_threads().
+_CV_DEFAULT_THREADS = cv2.getNumThreads()
+cv2.setNumThreads(1)
+
+
+@contextlib.contextmanager
+def _cv_all_threads():
+    # let OpenCV use its default thread count for one large call (e.g. a whole-image filter), then go back
+    prev = cv2.getNumThreads()
+    cv2.setNumThreads(_CV_DEFAULT_THREADS)
+    try:
+        yield
+    finally:
+        cv2.setNumThreads(prev)
+
+
+# Optional: msgpack lets the combined export store mask PNGs as raw bytes instead of base64 text.
+try:
+    import msgpack
+except Exception:
+    msgpack = None
+
+# Optional: orjson parses/serializes the grid and combined-mask JSON files several times faster than json.
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 try:
     from qfluentwidgets import (
         FluentWindow,
@@ -26,7 +60,9 @@ try:
         ComboBox,
         Pivot,
     )
+    _HAS_FLUENT = True
 except Exception:
+    _HAS_FLUENT = False
     FluentWindow = QtWidgets.QMainWindow
     PushButton = QtWidgets.QPushButton
     PrimaryPushButton = QtWidgets.QPushButton
@@ -37,9 +73,87 @@ except Exception:
     ComboBox = QtWidgets.QComboBox
     Pivot = None
 
+# widget capabilities, probed once at import instead of at each construction
+_HAS_PIVOT = Pivot is not None
+
+# file suffixes accepted by drag-and-drop onto the canvas
+_TIFF_SUFFIXES = ('.tif', '.tiff')
+
 # Item data roles in PyQt6 are scoped; keep existing arithmetic (UserRole + N)
 ROLE_BASE = int(QtCore.Qt.ItemDataRole.UserRole)
 
+# zlib level for every exported/embedded PNG: 1-3 encodes several times faster than the default 6 for
+# binary masks and unit crops at a small size cost; set to 9 for archival exports
+PNG_COMPRESSION = 3
+# the same level as a QImage.save() quality (Qt's PNG writer maps quality 0..100 to level 9..0)
+PNG_QT_QUALITY = 100 - (PNG_COMPRESSION * 91 + 8) // 9
+
+
+def _encode_png(arr):
+    # PNG bytes of `arr`, or None if OpenCV can't encode it
+    try:
+        ok, buf = cv2.imencode('.png', arr, [cv2.IMWRITE_PNG_COMPRESSION, PNG_COMPRESSION])
+    except Exception:
+        return None
+    return buf.tobytes() if ok else None
+
+
+def _write_png(path, arr) -> bool:
+    # encode with OpenCV and write through Python file IO: cv2.imwrite can't open non-ASCII paths on Windows
+    data = _encode_png(arr)
+    if data is None:
+        return False
+    try:
+        with open(path, 'wb') as f:
+            f.write(data)
+        return True
+    except Exception:
+        return False
+
+
+def _imread(path, flags=cv2.IMREAD_COLOR):
+    # cv2.imread through Python file IO (cv2.imread can't open non-ASCII paths on Windows); None if unreadable
+    try:
+        return cv2.imdecode(np.fromfile(path, dtype=np.uint8), flags)
+    except Exception:
+        return None
+
+
+def _premultiplied(bgra) -> np.ndarray:
+    # one BGRA pixel (QImage ARGB32 byte order) with colour channels scaled by alpha, for Format_ARGB32_Premultiplied
+    b, g, r, a = (int(v) for v in bgra)
+    return np.array([round(b * a / 255), round(g * a / 255), round(r * a / 255), a], dtype=np.uint8)
+
+
+@functools.lru_cache(maxsize=64)
+def _probe_image_size(path, mtime):
+    # (w, h) from the file header only (no pixel decode), or None if Qt can't parse it (e.g. no tiff plugin);
+    # `mtime` is part of the cache key so a rewritten file is probed again
+    size = QtGui.QImageReader(path).size()
+    if not size.isValid():
+        return None
+    return (int(size.width()), int(size.height()))
+
+
+def _json_dumps(obj, indent=False) -> str:
+    # orjson when available (numpy scalars/arrays and non-str keys allowed), stdlib json otherwise
+    if orjson is not None:
+        opts = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, option=opts).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def _json_load_file(path):
+    # read a whole JSON file; orjson parses the bytes directly
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
 class ImageWidget(QtWidgets.QWidget):
     selectionChanged = QtCore.pyqtSignal()
@@ -52,11 +166,51 @@ class ImageWidget(QtWidgets.QWidget):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.image = None  # QImage
+        # display-resolution copy of `image`, rebuilt only when the scale changes
+        self._scaled_cache = None  # QPixmap
+        # full-image grayscale view (and the QImage backing it) for slicing unit crops, see gray_crop()
+        self._gray = None
+        self._gray_owner = None
+        self._scaled_cache_scale = None
+        self._scaled_cache_smooth = False
+        # After a zoom step, scale with FastTransformation and upgrade to smooth once zooming settles.
+        self._fast_scaling = False
+        self._smooth_timer = QtCore.QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(100)
+        self._smooth_timer.timeout.connect(self._upgrade_to_smooth)
+        # drag repaints (selection rubber band, exclusion resize) are coalesced to at most one per ~16 ms
+        self._drag_update_timer = QtCore.QTimer(self)
+        self._drag_update_timer.setSingleShot(True)
+        self._drag_update_timer.setInterval(16)
+        self._drag_update_timer.timeout.connect(self.update)
+        # exclusionEditUpdated is likewise emitted at most once per ~16 ms during a handle drag (latest geometry)
+        self._pending_excl_payload = None
+        self._excl_emit_timer = QtCore.QTimer(self)
+        self._excl_emit_timer.setSingleShot(True)
+        self._excl_emit_timer.setInterval(16)
+        self._excl_emit_timer.timeout.connect(self._flush_excl_update)
         # positions are stored in image coordinates (not display coordinates)
         self.start_img_pos = None
         self.current_img_rect = None
         self.fixed_img_rect = None
         self.grid_rects = []
+        # (N, 4) int32 x/y/w/h arrays mirroring grid_rects in image and display coordinates
+        # (kept in sync lazily by _sync_grid_arrays)
+        self.grid_img = np.zeros((0, 4), dtype=np.int32)
+        self.grid_disp = np.zeros((0, 4), dtype=np.int32)
+        self.grid_row_of = {}
+        self._grid_src = None
+        # (key, pixmap) display-size copy of selected_mask_pixmap, keyed by (mask cacheKey, width, height)
+        self._selected_mask_scaled = None
+        # exclusion resize handle triangle relative to the handle point (built once, translated when drawn)
+        self._handle_poly = QtGui.QPolygon([QtCore.QPoint(0, 0), QtCore.QPoint(-10, 0), QtCore.QPoint(0, -10)])
+        # composited canvas overlays (see _overlay_layer_pixmap)
+        self._overlay_layer = None
+        self._overlay_layer_src = None
+        self._overlay_layer_grid = None
+        self._overlay_layer_key = None
+        self._grid_disp_scale = None
         self.setMinimumSize(400, 100)
         self.scale = 1.0
         self.offset = QtCore.QPoint(0, 0)
@@ -84,7 +238,10 @@ class ImageWidget(QtWidgets.QWidget):
         self.selected_mask_pixmap = None
         # optional QPainterPath outlining eroded mask (in image coordinates)
         self.erosion_path = None
-        # per-cell overlays to draw on the main canvas: {grid_idx: {'seg': QPixmap|None, 'defect': QPixmap|None}}
+        # erosion outline stroked once per (path, scale) into a display-space pixmap: (path, scale, topLeft, pixmap)
+        self._erosion_baked = None
+        # per-cell overlays to draw on the main canvas: {grid_idx: {'seg': QImage|None, 'defect': QImage|None}}
+        # (1-bit Format_Mono images with a tint colour table, see MainWindow._tint_mask_mono)
         self.cell_overlays = {}
         # current overlay mode for full-canvas drawing
         self.overlay_mode = 'Defect'
@@ -107,17 +264,23 @@ class ImageWidget(QtWidgets.QWidget):
                         paths.append(str(u.toLocalFile()))
                 except Exception:
                     continue
-            ok = any(p.lower().endswith(('.tif', '.tiff')) for p in paths)
+            ok = any(p.lower().endswith(_TIFF_SUFFIXES) for p in paths)
+            # the URL list can't change during a drag: dragMoveEvent reuses this decision
+            self._last_drag_ok = ok
             if ok:
                 event.acceptProposedAction()
             else:
                 event.ignore()
         except Exception:
+            self._last_drag_ok = False
             event.ignore()
 
     def dragMoveEvent(self, event: QtGui.QDragMoveEvent):
-        # Same policy as dragEnterEvent
-        self.dragEnterEvent(event)
+        # Same policy as dragEnterEvent (decided once on enter, not per mouse move)
+        if getattr(self, '_last_drag_ok', False):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
 
     def dropEvent(self, event: QtGui.QDropEvent):
         try:
@@ -130,7 +293,7 @@ class ImageWidget(QtWidgets.QWidget):
                 try:
                     if u.isLocalFile():
                         p = str(u.toLocalFile())
-                        if p.lower().endswith(('.tif', '.tiff')):
+                        if p.lower().endswith(_TIFF_SUFFIXES):
                             paths.append(p)
                 except Exception:
                     continue
@@ -143,18 +306,29 @@ class ImageWidget(QtWidgets.QWidget):
             event.ignore()
 
     def load_image(self, path):
-        img = QtGui.QImage(path)
+        self.set_image(self.decode_image(path))
+
+    @staticmethod
+    def decode_image(path) -> QtGui.QImage:
+        # Read `path` into a QImage (8-bit gray or RGB/RGBA). Only QImage and numpy are touched, so this is safe
+        # to run on a worker thread; raises RuntimeError if the file can't be decoded.
+        # TIFFs (often 16-bit or multi-page) go straight to OpenCV; Qt's tiff plugin is frequently missing and a
+        # failed QImage(path) still reads the whole file first
+        is_tiff = os.path.splitext(path)[1].lower() in _TIFF_SUFFIXES
+        img = QtGui.QImage() if is_tiff else QtGui.QImage(path)
         if img.isNull():
             # Fallback for TIFF variants / Qt plugin limitations.
-            arr = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+            arr = _imread(path, cv2.IMREAD_UNCHANGED)
             if arr is None:
                 raise RuntimeError('Failed to load image: ' + path)
 
             if arr.dtype != np.uint8:
                 if arr.dtype == np.uint16:
-                    arr = (arr / 256).astype(np.uint8)
+                    # high byte: same values as arr / 256 truncated, without a float64 temporary
+                    arr = (arr >> 8).astype(np.uint8)
                 else:
-                    arr = cv2.normalize(arr, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+                    # normalize straight into 8-bit (no float intermediate + astype copy)
+                    arr = cv2.normalize(arr, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
 
             if arr.ndim == 2:
                 h, w = arr.shape
@@ -167,8 +341,9 @@ class ImageWidget(QtWidgets.QWidget):
                 ).copy()
             else:
                 h, w = arr.shape[:2]
+                # swap channels in place (imread's buffer is ours), so the only extra copy is the QImage detach
                 if arr.shape[2] == 4:
-                    rgba = cv2.cvtColor(arr, cv2.COLOR_BGRA2RGBA)
+                    rgba = cv2.cvtColor(arr, cv2.COLOR_BGRA2RGBA, dst=arr)
                     img = QtGui.QImage(
                         rgba.data,
                         w,
@@ -177,7 +352,7 @@ class ImageWidget(QtWidgets.QWidget):
                         QtGui.QImage.Format.Format_RGBA8888,
                     ).copy()
                 else:
-                    rgb = cv2.cvtColor(arr, cv2.COLOR_BGR2RGB)
+                    rgb = cv2.cvtColor(arr, cv2.COLOR_BGR2RGB, dst=arr)
                     img = QtGui.QImage(
                         rgb.data,
                         w,
@@ -189,10 +364,36 @@ class ImageWidget(QtWidgets.QWidget):
         if img.isNull():
             raise RuntimeError('Failed to load image: ' + path)
 
+        # mold images are usually gray stored as RGB32/indexed: keep them at 1 byte/pixel
+        # (4x less memory for the source and every scale/crop/view taken from it)
+        if img.format() != QtGui.QImage.Format.Format_Grayscale8 and img.allGray():
+            img = img.convertToFormat(QtGui.QImage.Format.Format_Grayscale8)
+        return img
+
+    def set_image(self, img: QtGui.QImage):
+        # show a decoded image (see decode_image) and drop everything derived from the previous one
         self.image = img
+        self._gray = None
+        self._gray_owner = None
+        self._scaled_cache = None
+        self._scaled_cache_scale = None
+        self._scaled_cache_smooth = False
         self.updateScale()
         self.update()
 
+    def gray_crop(self, x: int, y: int, w: int, h: int):
+        # Zero-copy (h, w) uint8 slice of the source image, or None if the rect is not fully inside it.
+        # The full-image gray view is built once per loaded image and reused by every unit.
+        if not self.image:
+            return None
+        if self._gray is None:
+            with _cv_all_threads():
+                self._gray, self._gray_owner = segmentation.qimage_to_gray_view(self.image)
+        if x < 0 or y < 0 or w <= 0 or h <= 0:
+            return None
+        crop = self._gray[y:y + h, x:x + w]
+        return crop if crop.shape == (h, w) else None
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.updateScale()
@@ -219,19 +420,45 @@ class ImageWidget(QtWidgets.QWidget):
         self.setFixedSize(dw, dh)
         # offset within widget should be zero (drawing at 0,0)
         self.offset = QtCore.QPoint(0, 0)
-
-    def paintEvent(self, event):
-        painter = QtGui.QPainter(self)
-        painter.fillRect(self.rect(), QtCore.Qt.GlobalColor.black)
-        if self.image:
-            # draw scaled image at widget origin
-            disp = self.image.scaled(
+        # resample the source image once per scale change instead of on every repaint
+        if self._scaled_cache is None or self._scaled_cache_scale != self.scale:
+            # cheap nearest-neighbour pass while zooming; _upgrade_to_smooth redoes it when idle
+            self._fast_scaling = True
+            self._rebuild_scaled_cache()
+            self._smooth_timer.start()
+
+    def _transformation_mode(self):
+        if self._fast_scaling:
+            return QtCore.Qt.TransformationMode.FastTransformation
+        return QtCore.Qt.TransformationMode.SmoothTransformation
+
+    def _rebuild_scaled_cache(self):
+        self._scaled_cache = QtGui.QPixmap.fromImage(
+            self.image.scaled(
                 int(self.image.width() * self.scale),
                 int(self.image.height() * self.scale),
                 QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                QtCore.Qt.TransformationMode.SmoothTransformation,
+                self._transformation_mode(),
             )
-            painter.drawImage(0, 0, disp)
+        )
+        self._scaled_cache_scale = self.scale
+        self._scaled_cache_smooth = not self._fast_scaling
+
+    def _upgrade_to_smooth(self):
+        # zoom has settled: re-render the base image and overlays with smooth scaling
+        self._fast_scaling = False
+        if self.image and not self._scaled_cache_smooth:
+            self._rebuild_scaled_cache()
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        # only the exposed region needs repainting (most of the widget is off-screen when zoomed in)
+        clip = event.rect()
+        painter.fillRect(clip, QtCore.Qt.GlobalColor.black)
+        if self.image and self._scaled_cache is not None:
+            # draw cached scaled image at widget origin
+            painter.drawPixmap(clip, self._scaled_cache, clip)
         pen = QtGui.QPen(QtGui.QColor(0, 255, 0), 2)
         painter.setPen(pen)
         # draw current selection (convert image coords -> display coords)
@@ -245,12 +472,16 @@ class ImageWidget(QtWidgets.QWidget):
             painter.drawRect(r)
         pen = QtGui.QPen(QtGui.QColor(255, 255, 0), 1)
         painter.setPen(pen)
-        for r, idx in self.grid_rects:
-            # r is image-space rect tuple
-            img_r = QtCore.QRect(r[0], r[1], r[2], r[3])
-            dr = self.imgrect_to_display(img_r)
-            painter.drawRect(dr)
-            painter.drawText(dr.topLeft() + QtCore.QPoint(3, 12), str(idx))
+        # (display rect, grid idx) for cells intersecting the exposed region
+        visible = self._visible_grid_cells(clip)
+        if visible:
+            # one paint call for the whole grid instead of one per cell
+            painter.drawRects([dr for dr, _ in visible])
+            for dr, idx in visible:
+                # labels are unreadable on tiny cells (zoomed out); skip them
+                if dr.width() < 24:
+                    continue
+                painter.drawText(dr.topLeft() + QtCore.QPoint(3, 12), str(idx))
 
         # inspection view: draw only verdict markers and skip overlays
         if getattr(self, 'inspection_mode', False):
@@ -259,9 +490,11 @@ class ImageWidget(QtWidgets.QWidget):
             font = painter.font()
             font.setBold(True)
             painter.setFont(font)
-            for r, idx in self.grid_rects:
-                img_r = QtCore.QRect(int(r[0]), int(r[1]), int(r[2]), int(r[3]))
-                dr = self.imgrect_to_display(img_r)
+            fail_pen = QtGui.QPen(QtGui.QColor(255, 0, 0), 3)
+            pass_pen = QtGui.QPen(QtGui.QColor(0, 255, 0), 3)
+            # cells of a grid share one size, so the font is normally set once, not per cell
+            cur_size = None
+            for dr, idx in visible:
                 verdict = None
                 try:
                     verdict = self.inspection_results.get(idx)
@@ -274,14 +507,15 @@ class ImageWidget(QtWidgets.QWidget):
                     s = max(10.0, min(dr.width(), dr.height()) * 0.45)
                 except Exception:
                     s = 18.0
-                f = painter.font()
-                f.setPointSizeF(float(s))
-                painter.setFont(f)
+                if s != cur_size:
+                    font.setPointSizeF(float(s))
+                    painter.setFont(font)
+                    cur_size = s
                 if verdict:
-                    painter.setPen(QtGui.QPen(QtGui.QColor(255, 0, 0), 3))
+                    painter.setPen(fail_pen)
                     painter.drawText(dr, QtCore.Qt.AlignmentFlag.AlignCenter, 'X')
                 else:
-                    painter.setPen(QtGui.QPen(QtGui.QColor(0, 255, 0), 3))
+                    painter.setPen(pass_pen)
                     painter.drawText(dr, QtCore.Qt.AlignmentFlag.AlignCenter, 'O')
             painter.restore()
             return
@@ -289,64 +523,45 @@ class ImageWidget(QtWidgets.QWidget):
         # draw overlays for ALL units on the main canvas
         mode = getattr(self, 'overlay_mode', 'Defect')
         if mode != 'None' and getattr(self, 'cell_overlays', None):
-            painter.setOpacity(0.55)
-            for r, idx in self.grid_rects:
-                ov = self.cell_overlays.get(idx)
-                if not ov:
-                    continue
-                img_r = QtCore.QRect(int(r[0]), int(r[1]), int(r[2]), int(r[3]))
-                dr = self.imgrect_to_display(img_r)
-                if mode in ('Segmentation', 'Both'):
-                    seg_pm = ov.get('seg')
-                    if isinstance(seg_pm, QtGui.QPixmap):
-                        painter.drawPixmap(
-                            dr.topLeft(),
-                            seg_pm.scaled(
-                                dr.size(),
-                                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                                QtCore.Qt.TransformationMode.SmoothTransformation,
-                            ),
-                        )
-                if mode in ('Defect', 'Both'):
-                    defect_pm = ov.get('defect')
-                    if isinstance(defect_pm, QtGui.QPixmap):
-                        painter.drawPixmap(
-                            dr.topLeft(),
-                            defect_pm.scaled(
-                                dr.size(),
-                                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                                QtCore.Qt.TransformationMode.SmoothTransformation,
-                            ),
-                        )
-            painter.setOpacity(1.0)
+            # Canvas overlays carry their 0.55 opacity in the alpha channel (see refresh_canvas_overlays),
+            # so no painter opacity layer is needed. They are flat two-colour masks: nearest scaling is enough.
+            painter.save()
+            painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing, False)
+            painter.setRenderHint(QtGui.QPainter.RenderHint.SmoothPixmapTransform, False)
+            layer = self._overlay_layer_pixmap(mode)
+            if layer is not None:
+                # all cells are pre-composited into one image-size layer: scale only the exposed part at blit time
+                s = self.scale
+                src = QtCore.QRectF(clip.x() / s, clip.y() / s, clip.width() / s, clip.height() / s)
+                painter.drawPixmap(QtCore.QRectF(clip), layer, src)
+            painter.restore()
         # draw selected mask overlay if available
         if self.selected_cell_index is not None and self.selected_mask_pixmap:
-            # find rect for selected cell
-            for r, idx in self.grid_rects:
-                if idx == self.selected_cell_index:
-                    img_r = QtCore.QRect(r[0], r[1], r[2], r[3])
-                    dr = self.imgrect_to_display(img_r)
-                    # mask pixmap is in image coords with same size as img_r
-                    mask_scaled = self.selected_mask_pixmap.scaled(
-                        dr.size(),
+            # find rect for selected cell (display rects are already in grid_disp, no per-cell conversion)
+            self._sync_grid_arrays()
+            i = self.grid_row_of.get(self.selected_cell_index)
+            if i is not None:
+                dx, dy, dw, dh = (int(v) for v in self.grid_disp[i])
+                # mask pixmap is in image coords with the cell's size: scale it once per (mask, display size)
+                # and blit the cached copy on later paints (hover/drag repaints don't re-filter it)
+                pm = self.selected_mask_pixmap
+                key = (pm.cacheKey(), dw, dh)
+                if self._selected_mask_scaled is None or self._selected_mask_scaled[0] != key:
+                    self._selected_mask_scaled = (key, pm.scaled(
+                        dw,
+                        dh,
                         QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
                         QtCore.Qt.TransformationMode.SmoothTransformation,
-                    )
-                    painter.setOpacity(0.6)
-                    painter.drawPixmap(dr.topLeft(), mask_scaled)
-                    painter.setOpacity(1.0)
-                    break
+                    ))
+                painter.setOpacity(0.6)
+                painter.drawPixmap(dx, dy, self._selected_mask_scaled[1])
+                painter.setOpacity(1.0)
 
         # draw erosion outline if present (in image coordinates, scaled to display)
         if self.erosion_path is not None:
-            painter.save()
-            pen = QtGui.QPen(QtGui.QColor(0, 255, 255), 2)
-            pen.setCosmetic(True)
-            painter.setPen(pen)
-            painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-            painter.setWorldTransform(QtGui.QTransform().scale(self.scale, self.scale), False)
-            painter.drawPath(self.erosion_path)
-            painter.restore()
+            baked = self._erosion_pixmap()
+            if baked is not None:
+                painter.drawPixmap(baked[0], baked[1])
 
         # draw exclusion edit overlay (single shape) + resize handle/arrow
         if getattr(self, 'exclusion_edit_mode', False):
@@ -372,17 +587,132 @@ class ImageWidget(QtWidgets.QWidget):
                     handle_center = None
 
             if handle_center is not None:
-                # small arrow-like handle: a filled triangle + short line
+                # small arrow-like handle: a filled triangle + short line, drawn from the template at the handle
+                painter.translate(handle_center)
                 painter.setBrush(QtGui.QBrush(QtGui.QColor(255, 0, 255)))
-                size = 10
-                p1 = QtCore.QPoint(handle_center.x(), handle_center.y())
-                p2 = QtCore.QPoint(handle_center.x() - size, handle_center.y())
-                p3 = QtCore.QPoint(handle_center.x(), handle_center.y() - size)
-                painter.drawPolygon(QtGui.QPolygon([p1, p2, p3]))
+                painter.drawPolygon(self._handle_poly)
                 painter.setBrush(QtCore.Qt.BrushStyle.NoBrush)
-                painter.drawLine(handle_center, QtCore.QPoint(handle_center.x() - size * 2, handle_center.y() - size * 2))
+                painter.drawLine(0, 0, -20, -20)
 
             painter.restore()
+
+    def _sync_grid_arrays(self):
+        # Rebuild grid_img when the grid list changes and grid_disp when the grid or the scale changes.
+        # grid_rects is always replaced (never mutated in place), so an identity check is enough.
+        if self._grid_src is not self.grid_rects:
+            self.grid_img = np.array([r for r, _ in self.grid_rects], dtype=np.int32).reshape(-1, 4)
+            # grid idx -> row (first occurrence wins, like the hit-test), for O(1) lookups by index
+            self.grid_row_of = {}
+            for i, (_, idx) in enumerate(self.grid_rects):
+                self.grid_row_of.setdefault(idx, i)
+            self._grid_src = self.grid_rects
+            self._grid_disp_scale = None
+        if self._grid_disp_scale != self.scale:
+            # same truncation as imgrect_to_display, for all cells at once
+            self.grid_disp = (self.grid_img * self.scale).astype(np.int32)
+            self._grid_disp_scale = self.scale
+
+    def _visible_grid_cells(self, clip: QtCore.QRect):
+        # [(display QRect, grid idx)] for non-empty cells intersecting `clip` (display coordinates)
+        self._sync_grid_arrays()
+        gd = self.grid_disp
+        if gd.shape[0] == 0:
+            return []
+        x, y, w, h = gd[:, 0], gd[:, 1], gd[:, 2], gd[:, 3]
+        hit = (
+            (w > 0) & (h > 0)
+            & (x < clip.x() + clip.width()) & (x + w > clip.x())
+            & (y < clip.y() + clip.height()) & (y + h > clip.y())
+        )
+        return [
+            (QtCore.QRect(int(x[i]), int(y[i]), int(w[i]), int(h[i])), self.grid_rects[i][1])
+            for i in np.flatnonzero(hit)
+        ]
+
+    def _cell_at(self, img_pt: QtCore.QPoint):
+        # grid idx of the first cell containing image point `img_pt`, or None
+        self._sync_grid_arrays()
+        g = self.grid_img
+        if g.shape[0] == 0:
+            return None
+        px, py = img_pt.x(), img_pt.y()
+        hits = (g[:, 0] <= px) & (px < g[:, 0] + g[:, 2]) & (g[:, 1] <= py) & (py < g[:, 1] + g[:, 3])
+        if not hits.any():
+            return None
+        return self.grid_rects[int(np.argmax(hits))][1]
+
+    def _draw_cell_overlays(self, painter, cells, mode):
+        # draw the seg/defect overlays of `cells` ([(target rect, grid idx)]) for overlay `mode`
+        for r, idx in cells:
+            ov = self.cell_overlays.get(idx)
+            if not ov:
+                continue
+            for key, modes in (('seg', ('Segmentation', 'Both')), ('defect', ('Defect', 'Both'))):
+                if mode not in modes:
+                    continue
+                pm = ov.get(key)
+                if isinstance(pm, QtGui.QImage):
+                    painter.drawImage(r, pm)
+                elif isinstance(pm, QtGui.QPixmap):
+                    painter.drawPixmap(r, pm)
+
+    def _overlay_layer_pixmap(self, mode):
+        # Image-size pixmap with every cell's overlays composited once at full resolution, so a repaint is a
+        # single (scaled) blit instead of one alpha blend per cell, and its size does not grow with the zoom.
+        # Rebuilt only when the overlays dict, the grid, the mode or the image changes (not on zoom).
+        if not self.image:
+            return None
+        key = (mode, self.image.cacheKey())
+        if (self._overlay_layer is not None and self._overlay_layer_key == key
+                and self._overlay_layer_src is self.cell_overlays and self._overlay_layer_grid is self.grid_rects):
+            return self._overlay_layer
+        layer = QtGui.QImage(self.image.width(), self.image.height(), QtGui.QImage.Format.Format_ARGB32_Premultiplied)
+        layer.fill(QtCore.Qt.GlobalColor.transparent)
+        p = QtGui.QPainter(layer)
+        try:
+            cells = [
+                (QtCore.QRect(int(x), int(y), int(w), int(h)), idx)
+                for (x, y, w, h), idx in self.grid_rects
+                if w > 0 and h > 0
+            ]
+            self._draw_cell_overlays(p, cells, mode)
+        finally:
+            p.end()
+        self._overlay_layer = QtGui.QPixmap.fromImage(layer)
+        self._overlay_layer_src = self.cell_overlays
+        self._overlay_layer_grid = self.grid_rects
+        self._overlay_layer_key = key
+        return self._overlay_layer
+
+    def _erosion_pixmap(self):
+        # Return (topLeft, pixmap) holding the erosion outline stroked at the current scale.
+        # The path is only re-stroked when it is replaced or the zoom changes; repaints just blit it.
+        path = self.erosion_path
+        if path is None:
+            self._erosion_baked = None
+            return None
+        baked = self._erosion_baked
+        if baked is not None and baked[0] is path and baked[1] == self.scale:
+            return baked[2], baked[3]
+        disp = QtGui.QTransform().scale(self.scale, self.scale).map(path)
+        # pad by the pen width so the stroke is not clipped at the pixmap border
+        br = disp.boundingRect().toAlignedRect().adjusted(-2, -2, 2, 2)
+        if br.isEmpty():
+            self._erosion_baked = None
+            return None
+        pm = QtGui.QPixmap(br.size())
+        pm.fill(QtCore.Qt.GlobalColor.transparent)
+        p = QtGui.QPainter(pm)
+        pen = QtGui.QPen(QtGui.QColor(0, 255, 255), 2)
+        pen.setCosmetic(True)
+        p.setPen(pen)
+        p.setBrush(QtCore.Qt.BrushStyle.NoBrush)
+        p.translate(-br.left(), -br.top())
+        p.drawPath(disp)
+        p.end()
+        self._erosion_baked = (path, self.scale, br.topLeft(), pm)
+        return br.topLeft(), pm
+
     def mousePressEvent(self, event):
         if not self.image:
             return
@@ -426,20 +756,18 @@ class ImageWidget(QtWidgets.QWidget):
             img_pt = self.display_to_img(pos)
             # if drawing is disabled, treat click as selection only
             if not self.drawing_enabled:
-                for r, idx in self.grid_rects:
-                    x, y, w, h = int(r[0]), int(r[1]), int(r[2]), int(r[3])
-                    if x <= img_pt.x() < x + w and y <= img_pt.y() < y + h:
-                        self.cellClicked.emit(idx)
-                        return
+                idx = self._cell_at(img_pt)
+                if idx is not None:
+                    self.cellClicked.emit(idx)
+                    return
             # if not currently drawing, treat as click to select cell
             # but if we're in exclusion_mode, allow starting a drag instead
             if self.start_img_pos is None and not self.current_img_rect and not self.exclusion_mode:
                 # find cell under point
-                for r, idx in self.grid_rects:
-                    x, y, w, h = int(r[0]), int(r[1]), int(r[2]), int(r[3])
-                    if x <= img_pt.x() < x + w and y <= img_pt.y() < y + h:
-                        self.cellClicked.emit(idx)
-                        return
+                idx = self._cell_at(img_pt)
+                if idx is not None:
+                    self.cellClicked.emit(idx)
+                    return
             # if drawing disabled, do not start a drag
             if not self.drawing_enabled:
                 return
@@ -459,8 +787,8 @@ class ImageWidget(QtWidgets.QWidget):
                 new_w = max(1, int(img_pt.x() - ax))
                 new_h = max(1, int(img_pt.y() - ay))
                 self.exclusion_edit_rect = QtCore.QRect(int(ax), int(ay), int(new_w), int(new_h))
-                self.update()
-                self.exclusionEditUpdated.emit({'shape': 'rect', 'w': int(new_w), 'h': int(new_h)})
+                self._schedule_drag_update()
+                self._queue_excl_update({'shape': 'rect', 'w': int(new_w), 'h': int(new_h)})
                 return
             if self.exclusion_edit_shape == 'circle' and self.exclusion_edit_circle is not None:
                 try:
@@ -470,19 +798,37 @@ class ImageWidget(QtWidgets.QWidget):
                 # handle is on the right side of the circle; radius follows x distance
                 new_r = max(1, int(abs(img_pt.x() - cx)))
                 self.exclusion_edit_circle = (int(cx), int(cy), int(new_r))
-                self.update()
-                self.exclusionEditUpdated.emit({'shape': 'circle', 'r': int(new_r)})
+                self._schedule_drag_update()
+                self._queue_excl_update({'shape': 'circle', 'r': int(new_r)})
                 return
 
         if self.start_img_pos is not None:
             img_pt = self.display_to_img(event.pos())
             self.current_img_rect = QtCore.QRect(self.start_img_pos, img_pt).normalized()
-            self.update()
+            self._schedule_drag_update()
+
+    def _queue_excl_update(self, payload):
+        self._pending_excl_payload = payload
+        if not self._excl_emit_timer.isActive():
+            self._excl_emit_timer.start()
+
+    def _flush_excl_update(self):
+        self._excl_emit_timer.stop()
+        payload, self._pending_excl_payload = self._pending_excl_payload, None
+        if payload is not None:
+            self.exclusionEditUpdated.emit(payload)
+
+    def _schedule_drag_update(self):
+        # repaint on the next drag tick; mouse moves arriving before it fires share that one paint
+        if not self._drag_update_timer.isActive():
+            self._drag_update_timer.start()
 
     def mouseReleaseEvent(self, event):
         if event.button() == QtCore.Qt.MouseButton.LeftButton and getattr(self, '_excl_dragging_handle', False):
             self._excl_dragging_handle = False
             self._excl_drag_anchor = None
+            # deliver the last throttled update before the commit
+            self._flush_excl_update()
             # commit current geometry
             if getattr(self, 'exclusion_edit_mode', False):
                 if self.exclusion_edit_shape == 'rect' and isinstance(self.exclusion_edit_rect, QtCore.QRect):
@@ -573,7 +919,8 @@ class MainWindow(QtWidgets.QMainWindow):
         # Path list aligned 1:1 with the image combo box indices.
         # We maintain this ourselves because some Fluent ComboBox variants don't reliably preserve userData/currentData.
         self._image_combo_paths = []  # list[str]
-        self._image_states = {}  # path -> {'seg': list[QPixmap|None], 'def': list[QPixmap|None], 'inspection': dict[int,bool]}
+        self._path_to_index = {}  # path -> index into _image_combo_paths (rebuild if paths are ever removed)
+        self._image_states = {}  # path -> {'seg': list[QImage|QPixmap|None], 'def': list[QImage|QPixmap|None], 'inspection': dict[int,bool]}
         self._current_image_path = None
         self._current_image_size = None  # (w,h)
         # Reference/original image: indexing + exclusions are defined here.
@@ -639,6 +986,7 @@ class MainWindow(QtWidgets.QMainWindow):
             'Adaptive C:': 'How strict the adaptive method is. Higher can remove more.',
             'Threshold:': 'Sensitivity for defect detection. Lower finds more; higher finds fewer.',
             'Min area (px):': 'Ignore tiny specks smaller than this size.',
+            'Background:': 'Local background for the threshold method. Box = fast mean; Median = slower, ignores specks.',
             'Mask erosion (px):': 'Shrink the area inward so edges are ignored.',
             'Overlay mode:': 'What is drawn on the image (segmentation/defects/both).'
         }
@@ -665,25 +1013,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.blocks_y = SpinBox(); self.blocks_y.setRange(0, 50); self.blocks_y.setValue(0)
 
         form = QtWidgets.QFormLayout()
-        units_row = QtWidgets.QHBoxLayout()
-        units_row.addWidget(QtWidgets.QLabel('X'))
-        units_row.addWidget(self.units_x)
-        units_row.addSpacing(6)
-        units_row.addWidget(QtWidgets.QLabel('Y'))
-        units_row.addWidget(self.units_y)
-        self.units_x.setToolTip('Units along X (left to right).')
-        self.units_y.setToolTip('Units along Y (top to bottom).')
-        form.addRow(_lbl('Units:', tips.get('Units:')), units_row)
-
-        blocks_row = QtWidgets.QHBoxLayout()
-        blocks_row.addWidget(QtWidgets.QLabel('X'))
-        blocks_row.addWidget(self.blocks_x)
-        blocks_row.addSpacing(6)
-        blocks_row.addWidget(QtWidgets.QLabel('Y'))
-        blocks_row.addWidget(self.blocks_y)
-        self.blocks_x.setToolTip('Blocks along X (left to right).')
-        self.blocks_y.setToolTip('Blocks along Y (top to bottom).')
-        form.addRow(_lbl('Blocks:', tips.get('Blocks:')), blocks_row)
+
+        def _add_xy_row(title: str, what: str, spin_x, spin_y):
+            # one form row "<title> X [spin] Y [spin]"; the row is a plain layout, not a container widget
+            row = QtWidgets.QHBoxLayout()
+            row.addWidget(QtWidgets.QLabel('X'))
+            row.addWidget(spin_x)
+            row.addSpacing(6)
+            row.addWidget(QtWidgets.QLabel('Y'))
+            row.addWidget(spin_y)
+            spin_x.setToolTip(f'{what} along X (left to right).')
+            spin_y.setToolTip(f'{what} along Y (top to bottom).')
+            form.addRow(_lbl(title, tips.get(title)), row)
+
+        _add_xy_row('Units:', 'Units', self.units_x, self.units_y)
+        _add_xy_row('Blocks:', 'Blocks', self.blocks_x, self.blocks_y)
         v.addLayout(form)
 
         # spacings: sliders + spinboxes for X/Y for units and blocks
@@ -714,15 +1058,22 @@ class MainWindow(QtWidgets.QMainWindow):
         _add_slider_row('Block spacing X (px):', self.block_space_x_slider, self.block_space_x)
         _add_slider_row('Block spacing Y (px):', self.block_space_y_slider, self.block_space_y)
 
-        # wire sliders and spinboxes together
-        self.unit_space_x_slider.valueChanged.connect(self.unit_space_x.setValue)
-        self.unit_space_y_slider.valueChanged.connect(self.unit_space_y.setValue)
-        self.block_space_x_slider.valueChanged.connect(self.block_space_x.setValue)
-        self.block_space_y_slider.valueChanged.connect(self.block_space_y.setValue)
-        self.unit_space_x.valueChanged.connect(self.unit_space_x_slider.setValue)
-        self.unit_space_y.valueChanged.connect(self.unit_space_y_slider.setValue)
-        self.block_space_x.valueChanged.connect(self.block_space_x_slider.setValue)
-        self.block_space_y.valueChanged.connect(self.block_space_y_slider.setValue)
+        # wire sliders and spinboxes together: the slider drives the spinbox (whose valueChanged feeds the
+        # preview); the spinbox mirrors back into the slider with its signals blocked, so there is no echo
+        def _link_slider(slider: QtWidgets.QSlider, spin):
+            def _mirror(v):
+                with QtCore.QSignalBlocker(slider):
+                    slider.setValue(v)
+            slider.valueChanged.connect(spin.setValue)
+            spin.valueChanged.connect(_mirror)
+
+        for slider, spin in (
+            (self.unit_space_x_slider, self.unit_space_x),
+            (self.unit_space_y_slider, self.unit_space_y),
+            (self.block_space_x_slider, self.block_space_x),
+            (self.block_space_y_slider, self.block_space_y),
+        ):
+            _link_slider(slider, spin)
 
         self.apply_btn = PrimaryPushButton('Apply Indexing')
         self.apply_btn.clicked.connect(self.apply_indexing)
@@ -745,12 +1096,8 @@ class MainWindow(QtWidgets.QMainWindow):
         v.addLayout(io_row)
 
         # Internal thumbnails list (not shown in the UI).
-        # This is kept as an internal data store for per-unit pixmaps/masks.
+        # This is kept as an internal data store for per-unit pixmaps/masks (no icons are built).
         self.thumb_list = QtWidgets.QListWidget()
-        self.thumb_list.setViewMode(QtWidgets.QListView.ViewMode.IconMode)
-        self.thumb_list.setIconSize(QtCore.QSize(128, 128))
-        self.thumb_list.setResizeMode(QtWidgets.QListView.ResizeMode.Adjust)
-        self.thumb_list.setMovement(QtWidgets.QListView.Movement.Static)
         self.thumb_list.hide()
 
         # Exclusions: add/exclusion index and shape
@@ -820,6 +1167,14 @@ class MainWindow(QtWidgets.QMainWindow):
         export_masks_btn = PushButton('Export Masks + CSV')
         export_masks_btn.clicked.connect(self.export_masks_and_csv)
         v.addWidget(export_masks_btn)
+        # one masks.zip (stored, not deflated) instead of N small PNG files, e.g. for network shares
+        self.zip_masks_btn = ToggleButton('Pack masks into ZIP')
+        try:
+            self.zip_masks_btn.setCheckable(True)
+        except Exception:
+            pass
+        self.zip_masks_btn.setToolTip('Write all mask PNGs into a single masks.zip next to the CSV.')
+        v.addWidget(self.zip_masks_btn)
 
         v.addStretch(1)
 
@@ -835,7 +1190,7 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
 
         # Fluent sub-navigation for defect types
-        defect_pivot = Pivot() if Pivot is not None else None
+        defect_pivot = Pivot() if _HAS_PIVOT else None
         defect_stack = QtWidgets.QStackedWidget()
         if defect_pivot is not None:
             dv.addWidget(defect_pivot)
@@ -871,6 +1226,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.defect_method.addItems(['threshold', 'canny'])
         self.defect_threshold = SpinBox(); self.defect_threshold.setRange(0, 255); self.defect_threshold.setValue(24)
         self.defect_min_area = SpinBox(); self.defect_min_area.setRange(0, 100000); self.defect_min_area.setValue(20)
+        self.defect_background = ComboBox()
+        self.defect_background.addItems(['box', 'median'])
         # mask erosion: shrink segmentation mask by this many pixels before detection
         self.defect_mask_erode = SpinBox(); self.defect_mask_erode.setRange(0, 200); self.defect_mask_erode.setValue(6)
         # overlay display mode
@@ -882,11 +1239,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.defect_method.setToolTip('Threshold = simple + fast. Canny = edge-based (more sensitive).')
         self.defect_threshold.setToolTip(tips.get('Threshold:'))
         self.defect_min_area.setToolTip(tips.get('Min area (px):'))
+        self.defect_background.setToolTip(tips.get('Background:'))
         self.defect_mask_erode.setToolTip(tips.get('Mask erosion (px):'))
         self.overlay_mode.setToolTip(tips.get('Overlay mode:'))
         defect_form.addRow(_lbl('Method:', 'How the app finds foreign material.'), self.defect_method)
         defect_form.addRow(_lbl('Threshold:', tips.get('Threshold:')), self.defect_threshold)
         defect_form.addRow(_lbl('Min area (px):', tips.get('Min area (px):')), self.defect_min_area)
+        defect_form.addRow(_lbl('Background:', tips.get('Background:')), self.defect_background)
         defect_form.addRow(_lbl('Mask erosion (px):', tips.get('Mask erosion (px):')), self.defect_mask_erode)
         defect_form.addRow(_lbl('Overlay mode:', tips.get('Overlay mode:')), self.overlay_mode)
         pv.addLayout(defect_form)
@@ -896,8 +1255,20 @@ class MainWindow(QtWidgets.QMainWindow):
         self._defect_autoupdate_timer = QtCore.QTimer(self)
         self._defect_autoupdate_timer.setSingleShot(True)
         self._defect_autoupdate_timer.timeout.connect(self._auto_update_defect_selected_unit)
+        # images are decoded on a single I/O thread; this timer finishes the switch on the GUI thread
+        self._io_pool = None
+        self._image_load = None
+        self._image_load_timer = QtCore.QTimer(self)
+        self._image_load_timer.setInterval(15)
+        self._image_load_timer.timeout.connect(self._drain_image_load)
+        # batch defect detection runs on the worker pool; this timer applies finished units on the GUI thread
+        self._defect_batch = None
+        self._defect_batch_timer = QtCore.QTimer(self)
+        self._defect_batch_timer.setInterval(15)
+        self._defect_batch_timer.timeout.connect(self._drain_defect_batch)
         self.defect_threshold.valueChanged.connect(self.schedule_defect_autoupdate)
         self.defect_min_area.valueChanged.connect(self.schedule_defect_autoupdate)
+        self.defect_background.currentIndexChanged.connect(self.schedule_defect_autoupdate)
         # recompute erosion outline when mask-erode value changes
         if hasattr(self, 'defect_mask_erode'):
             self.defect_mask_erode.valueChanged.connect(lambda _: self.update_erosion_outline(self.img_widget.selected_cell_index))
@@ -916,15 +1287,13 @@ class MainWindow(QtWidgets.QMainWindow):
         test_row = QtWidgets.QHBoxLayout(); test_row.addWidget(test_btn); test_row.addWidget(test_all_btn)
         pv.addLayout(test_row)
 
-        # Inspection toggle (Fluent switch)
-        try:
+        # Inspection toggle (Fluent switch; a checkable push button without qfluentwidgets)
+        if _HAS_FLUENT:
             self.run_insp_btn = SwitchButton('Run Inspection')
-        except Exception:
+        else:
             self.run_insp_btn = ToggleButton('Run Inspection')
-        try:
-            self.run_insp_btn.setChecked(False)
-        except Exception:
-            pass
+            self.run_insp_btn.setCheckable(True)
+        self.run_insp_btn.setChecked(False)
         if hasattr(self.run_insp_btn, 'toggled'):
             self.run_insp_btn.toggled.connect(self.on_inspection_toggled)
         elif hasattr(self.run_insp_btn, 'checkedChanged'):
@@ -935,18 +1304,25 @@ class MainWindow(QtWidgets.QMainWindow):
         if defect_pivot is not None:
             defect_pivot.addItem('foreign', 'Foreign material', onClick=lambda: defect_stack.setCurrentWidget(particle_tab))
 
-        # Placeholder for additional defect types
-        crack_tab = QtWidgets.QWidget()
-        cvlay = QtWidgets.QVBoxLayout(crack_tab)
-        try:
-            cvlay.setSizeConstraint(QtWidgets.QLayout.SizeConstraint.SetMinAndMaxSize)
-        except Exception:
-            pass
-        cvlay.addWidget(QtWidgets.QLabel('Crack detection (placeholder)'))
-        cvlay.addStretch(1)
-        defect_stack.addWidget(crack_tab)
+        # Placeholder for additional defect types: nothing else reads its widgets, so the page is only built the
+        # first time its pivot item is clicked (never, without a pivot)
+        def _show_crack_tab():
+            crack_tab = getattr(self, '_crack_tab', None)
+            if crack_tab is None:
+                crack_tab = QtWidgets.QWidget()
+                cvlay = QtWidgets.QVBoxLayout(crack_tab)
+                try:
+                    cvlay.setSizeConstraint(QtWidgets.QLayout.SizeConstraint.SetMinAndMaxSize)
+                except Exception:
+                    pass
+                cvlay.addWidget(QtWidgets.QLabel('Crack detection (placeholder)'))
+                cvlay.addStretch(1)
+                defect_stack.addWidget(crack_tab)
+                self._crack_tab = crack_tab
+            defect_stack.setCurrentWidget(crack_tab)
+
         if defect_pivot is not None:
-            defect_pivot.addItem('crack', 'Crack', onClick=lambda: defect_stack.setCurrentWidget(crack_tab))
+            defect_pivot.addItem('crack', 'Crack', onClick=_show_crack_tab)
             defect_pivot.setCurrentItem('foreign')
         else:
             defect_stack.setCurrentWidget(particle_tab)
@@ -956,7 +1332,7 @@ class MainWindow(QtWidgets.QMainWindow):
         right_layout = QtWidgets.QVBoxLayout(right_container)
         right_layout.setContentsMargins(0, 0, 0, 0)
 
-        self.right_pivot = Pivot() if Pivot is not None else None
+        self.right_pivot = Pivot() if _HAS_PIVOT else None
         self.right_stack = QtWidgets.QStackedWidget()
         self.right_stack.addWidget(ctrl)
         self.right_stack.addWidget(defect_tab)
@@ -984,20 +1360,16 @@ class MainWindow(QtWidgets.QMainWindow):
         hbox.addWidget(right_container)
 
         self.resize(1200, 600)
-        # live update connections: update preview whenever parameters change
-        self.units_x.valueChanged.connect(self.update_grid_preview)
-        self.units_y.valueChanged.connect(self.update_grid_preview)
-        self.blocks_x.valueChanged.connect(self.update_grid_preview)
-        self.blocks_y.valueChanged.connect(self.update_grid_preview)
-        self.unit_space_x.valueChanged.connect(self.update_grid_preview)
-        self.unit_space_y.valueChanged.connect(self.update_grid_preview)
-        self.block_space_x.valueChanged.connect(self.update_grid_preview)
-        self.block_space_y.valueChanged.connect(self.update_grid_preview)
-        # sliders should also trigger preview
-        self.unit_space_x_slider.valueChanged.connect(self.update_grid_preview)
-        self.unit_space_y_slider.valueChanged.connect(self.update_grid_preview)
-        self.block_space_x_slider.valueChanged.connect(self.update_grid_preview)
-        self.block_space_y_slider.valueChanged.connect(self.update_grid_preview)
+        # live update connections: update preview whenever parameters change.
+        # Debounced so a burst of valueChanged signals (spinbox arrows, slider drags) rebuilds the grid once.
+        self._grid_preview_timer = QtCore.QTimer(self)
+        self._grid_preview_timer.setSingleShot(True)
+        self._grid_preview_timer.setInterval(40)
+        self._grid_preview_timer.timeout.connect(self.update_grid_preview)
+        # spacing sliders are mirrored into the spacing spinboxes, so they trigger the preview through them
+        for spin in (self.units_x, self.units_y, self.blocks_x, self.blocks_y,
+                     self.unit_space_x, self.unit_space_y, self.block_space_x, self.block_space_y):
+            spin.valueChanged.connect(self.schedule_grid_preview)
         self.img_widget.selectionChanged.connect(self.update_grid_preview)
         self.img_widget.cellClicked.connect(self.on_cell_clicked)
         # Thumbnail preview is hidden in improved_UI, so selection changes come from
@@ -1013,22 +1385,51 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
 
-    def _snapshot_current_results(self):
-        """Capture current per-unit masks + inspection results for the active image."""
+    def _snapshot_current_results(self, cold: bool = False):
+        """Capture current per-unit masks + inspection results for the active image.
+
+        With `cold` (the image is being switched away from) masks are stored as QImages (plain memory,
+        not display-server pixmaps); otherwise the pixmaps themselves are kept, with no conversion.
+        """
         if not self._current_image_path:
             return
+        keep = self._cold_mask if cold else self._hot_mask
         seg_masks = []
         def_masks = []
         for i in range(self.thumb_list.count()):
             item = self.thumb_list.item(i)
-            seg_masks.append(item.data(ROLE_BASE + 1) if item is not None else None)
-            def_masks.append(item.data(ROLE_BASE + 2) if item is not None else None)
+            seg_masks.append(keep(item.data(ROLE_BASE + 1)) if item is not None else None)
+            def_masks.append(keep(item.data(ROLE_BASE + 2)) if item is not None else None)
         self._image_states[self._current_image_path] = {
             'seg': seg_masks,
             'def': def_masks,
             'inspection': dict(getattr(self.img_widget, 'inspection_results', {}) or {}),
         }
 
+    @staticmethod
+    def _hot_mask(pm):
+        return pm if isinstance(pm, QtGui.QPixmap) and not pm.isNull() else None
+
+    @staticmethod
+    def _cold_mask(pm):
+        return pm.toImage() if isinstance(pm, QtGui.QPixmap) and not pm.isNull() else None
+
+    @staticmethod
+    def _warm_mask(img):
+        # QPixmap for a stored mask (kept pixmaps are returned as is); QImages are converted through a cache
+        # keyed by the image, so restoring the same state twice hands out the same pixmap (and keeps the
+        # cacheKey-based overlay/PNG caches valid)
+        if isinstance(img, QtGui.QPixmap):
+            return img if not img.isNull() else None
+        if not isinstance(img, QtGui.QImage) or img.isNull():
+            return None
+        key = f'cold:{img.cacheKey()}'
+        pm = QtGui.QPixmapCache.find(key)
+        if pm is None or pm.isNull():
+            pm = QtGui.QPixmap.fromImage(img)
+            QtGui.QPixmapCache.insert(key, pm)
+        return pm
+
     def _get_reference_seg_masks(self):
         """Return the reference (original image) segmentation masks list, or None if not available."""
         if not self._reference_image_path:
@@ -1037,8 +1438,8 @@ class MainWindow(QtWidgets.QMainWindow):
         seg_masks = st.get('seg')
         if not seg_masks:
             return None
-        for pm in seg_masks:
-            if isinstance(pm, QtGui.QPixmap):
+        for m in seg_masks:
+            if isinstance(m, (QtGui.QImage, QtGui.QPixmap)):
                 return seg_masks
         return None
 
@@ -1048,14 +1449,12 @@ class MainWindow(QtWidgets.QMainWindow):
         if not seg_masks:
             return False
         n = self.thumb_list.count()
-        for i in range(n):
-            item = self.thumb_list.item(i)
-            if item is None:
-                continue
-            if i < len(seg_masks) and isinstance(seg_masks[i], QtGui.QPixmap):
-                item.setData(ROLE_BASE + 1, seg_masks[i])
-            else:
-                item.setData(ROLE_BASE + 1, None)
+        with self._thumb_list_batch(data_only=True):
+            for i in range(n):
+                item = self.thumb_list.item(i)
+                if item is None:
+                    continue
+                item.setData(ROLE_BASE + 1, self._warm_mask(seg_masks[i]) if i < len(seg_masks) else None)
         return True
 
     def _restore_results_for_path(self, path: str):
@@ -1066,18 +1465,13 @@ class MainWindow(QtWidgets.QMainWindow):
         seg_masks = st.get('seg') or []
         def_masks = st.get('def') or []
         n = self.thumb_list.count()
-        for i in range(n):
-            item = self.thumb_list.item(i)
-            if item is None:
-                continue
-            if i < len(seg_masks) and isinstance(seg_masks[i], QtGui.QPixmap):
-                item.setData(ROLE_BASE + 1, seg_masks[i])
-            else:
-                item.setData(ROLE_BASE + 1, None)
-            if i < len(def_masks) and isinstance(def_masks[i], QtGui.QPixmap):
-                item.setData(ROLE_BASE + 2, def_masks[i])
-            else:
-                item.setData(ROLE_BASE + 2, None)
+        with self._thumb_list_batch(data_only=True):
+            for i in range(n):
+                item = self.thumb_list.item(i)
+                if item is None:
+                    continue
+                item.setData(ROLE_BASE + 1, self._warm_mask(seg_masks[i]) if i < len(seg_masks) else None)
+                item.setData(ROLE_BASE + 2, self._warm_mask(def_masks[i]) if i < len(def_masks) else None)
         # Do not automatically enable inspection mode here; switching logic decides.
         try:
             self.img_widget.inspection_results = dict(st.get('inspection') or {})
@@ -1088,16 +1482,16 @@ class MainWindow(QtWidgets.QMainWindow):
         if not path:
             return
         # add to combo if missing
-        if path not in self._images:
+        if path not in self._path_to_index:
             self._images.append(path)
             self._image_combo_paths.append(path)
+            self._path_to_index[path] = len(self._image_combo_paths) - 1
             name = os.path.basename(path)
             # Always add without userData; we rely on _image_combo_paths for correctness.
             self.image_combo.addItem(name)
         if switch_to:
-            try:
-                idx = self._image_combo_paths.index(path)
-            except ValueError:
+            idx = self._path_to_index.get(path)
+            if idx is None:
                 return
             try:
                 with QtCore.QSignalBlocker(self.image_combo):
@@ -1121,13 +1515,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self._ensure_image_registered(p, switch_to=False)
         if self._current_image_path is None:
             if self._reference_image_path is None:
+                # its size is taken from the decoded image when the switch completes
                 self._reference_image_path = first
-                try:
-                    arr = cv2.imread(first, cv2.IMREAD_UNCHANGED)
-                    if arr is not None:
-                        self._reference_image_size = (int(arr.shape[1]), int(arr.shape[0]))
-                except Exception:
-                    pass
             self._switch_to_image(first)
             self._ensure_image_registered(first, switch_to=True)
 
@@ -1137,7 +1526,7 @@ class MainWindow(QtWidgets.QMainWindow):
             paths = list(paths) if isinstance(paths, (list, tuple)) else []
         except Exception:
             paths = []
-        paths = [p for p in paths if isinstance(p, str) and p.lower().endswith(('.tif', '.tiff'))]
+        paths = [p for p in paths if isinstance(p, str) and p.lower().endswith(_TIFF_SUFFIXES)]
         if not paths:
             return
 
@@ -1149,13 +1538,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Mirror load_image() behavior.
         if self._reference_image_path is None:
+            # its size is taken from the decoded image when the switch completes
             self._reference_image_path = first
-            try:
-                arr = cv2.imread(first, cv2.IMREAD_UNCHANGED)
-                if arr is not None:
-                    self._reference_image_size = (int(arr.shape[1]), int(arr.shape[0]))
-            except Exception:
-                pass
 
         self.statusBar().showMessage('Loading dropped image...', 2000)
         self._switch_to_image(first)
@@ -1178,6 +1562,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if not path:
             return
         if path == self._current_image_path:
+            # back to the shown image: a decode still pending for another one must not replace it
+            self._cancel_image_load()
             return
         self._switch_to_image(str(path))
 
@@ -1190,25 +1576,27 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.critical(self, 'Error', f'Image path not found:\n{path}')
             return
 
-        # snapshot current results before switching
-        self._snapshot_current_results()
-
-        # Prefer OpenCV for size probing to avoid Qt TIFF plugin warnings for some TIFF variants.
-        new_size = None
+        # Decode off the GUI thread (large TIFFs take a while); _drain_image_load finishes the switch.
+        # A newer request supersedes a pending one; repeating the pending path is a no-op.
+        pending = self._image_load
+        if pending is not None and pending['path'] == path:
+            return
+        # a header probe rejects a mismatched image before paying for its decode (checked again after decoding)
         try:
-            arr = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-            if arr is not None:
-                new_size = (int(arr.shape[1]), int(arr.shape[0]))
+            probed = _probe_image_size(path, os.path.getmtime(path))
         except Exception:
-            new_size = None
-
-        # Establish reference/original image on first load.
-        if self._reference_image_path is None:
-            self._reference_image_path = path
-            self._reference_image_size = new_size
+            probed = None
+        if self._size_switch_blocked(probed):
+            return
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1)
+        self._image_load = {'path': path, 'future': self._io_pool.submit(ImageWidget.decode_image, path)}
+        self.statusBar().showMessage(f'Loading {os.path.basename(path)}...')
+        self._image_load_timer.start()
 
+    def _size_switch_blocked(self, new_size):
         # Requirement: keep the same indexing/exclusions/masks as the original image.
-        # If a grid/base-unit exists, block switching to an image with a different size.
+        # If a grid/base-unit exists, block switching to an image with a different size (tells the user; True if blocked).
         if self._reference_image_size is not None and new_size is not None and new_size != self._reference_image_size and (
             bool(self.img_widget.grid_rects) or bool(self.img_widget.fixed_img_rect)
         ):
@@ -1219,13 +1607,53 @@ class MainWindow(QtWidgets.QMainWindow):
                 'Because indexing and masks must match the original, switching is blocked.\n\n'
                 'Please use images with the same resolution as the original.'
             )
+            return True
+        return False
+
+    def _cancel_image_load(self):
+        # drop a pending _switch_to_image decode (its result is discarded if it is already running)
+        load = self._image_load
+        if load is None:
             return
+        self._image_load = None
+        self._image_load_timer.stop()
+        load['future'].cancel()
+        self.statusBar().clearMessage()
 
+    def _drain_image_load(self):
+        load = self._image_load
+        if load is None:
+            self._image_load_timer.stop()
+            return
+        if not load['future'].done():
+            return
+        self._image_load_timer.stop()
+        self._image_load = None
+        self.statusBar().clearMessage()
         try:
-            self.img_widget.load_image(path)
+            img = load['future'].result()
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, 'Error', str(e))
             return
+        self._finish_switch_to_image(load['path'], img)
+
+    def _finish_switch_to_image(self, path: str, img: QtGui.QImage):
+        # snapshot current results before switching (as QImages: the image becomes inactive)
+        self._snapshot_current_results(cold=True)
+
+        # the decoded image gives the size (no separate probe read of the file)
+        new_size = (int(img.width()), int(img.height()))
+
+        # Establish reference/original image on first load.
+        if self._reference_image_path is None:
+            self._reference_image_path = path
+        if self._reference_image_path == path and self._reference_image_size is None:
+            self._reference_image_size = new_size
+
+        if self._size_switch_blocked(new_size):
+            return
+
+        self.img_widget.set_image(img)
 
         self._current_image_path = path
         self._current_image_size = (int(self.img_widget.image.width()), int(self.img_widget.image.height()))
@@ -1270,7 +1698,6 @@ class MainWindow(QtWidgets.QMainWindow):
             self.populate_thumbnails()
             # restore per-image defect + inspection cached results
             self._restore_results_for_path(path)
-            self.refresh_thumbnail_icons()
             self.refresh_canvas_overlays()
 
             # Auto-run segmentation for the newly selected image.
@@ -1330,12 +1757,11 @@ class MainWindow(QtWidgets.QMainWindow):
         seg_mask_pm = item.data(ROLE_BASE + 1)
         if not isinstance(pix, QtGui.QPixmap) or not isinstance(seg_mask_pm, QtGui.QPixmap):
             return
-        pm_mask = self._detect_defects_on_pix(pix, seg_mask_pm, verbose=False)
+        pm_mask = self._detect_defects_on_pix(pix, seg_mask_pm, verbose=False, row=row)
         item.setData(ROLE_BASE + 2, pm_mask if isinstance(pm_mask, QtGui.QPixmap) else None)
         # refresh overlays to reflect the new mask values
         if self.img_widget.selected_cell_index == row:
             self.update_selected_overlay(row)
-        self.refresh_thumbnail_icons()
         self.refresh_canvas_overlays()
 
     def exit_inspection_mode(self, force_overlay_mode: str = 'Both'):
@@ -1354,7 +1780,6 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
         self.update_selected_overlay(self.img_widget.selected_cell_index)
-        self.refresh_thumbnail_icons()
         self.refresh_canvas_overlays()
         self.img_widget.update()
 
@@ -1439,10 +1864,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.overlay_mode.setCurrentText('Both')
         except Exception:
             pass
-        pm_mask = self._detect_defects_on_pix(pix, seg_mask_pm)
-        # store (or clear) defect mask, then refresh icons for all units
+        pm_mask, area = self._detect_defects_on_pix(pix, seg_mask_pm, return_area=True, row=row)
+        # store (or clear) defect mask, then refresh the canvas overlays
         item.setData(ROLE_BASE + 2, pm_mask if isinstance(pm_mask, QtGui.QPixmap) else None)
-        self.refresh_thumbnail_icons()
         self.refresh_canvas_overlays()
         if pm_mask is None:
             QtWidgets.QMessageBox.information(self, 'Info', 'No defects found (or detection failed).')
@@ -1457,122 +1881,128 @@ class MainWindow(QtWidgets.QMainWindow):
         self.img_widget.selected_cell_index = row
         self.update_selected_overlay(row)
         self.center_on_cell(row)
-        # compute area and log result
-        try:
-            qim = pm_mask.toImage()
-            arr = segmentation.qimage_to_gray_array(qim)
-            stats = segmentation.mask_stats(arr)
-            area = stats['area']
-        except Exception:
-            area = 0
+        # log result
         verdict = 'NG' if area >= int(self.defect_min_area.value()) else 'OK'
         self.log(f'Unit {row}: defect area={area} px -> {verdict}')
 
-    def _detect_defects_on_pix(self, pix: QtGui.QPixmap, seg_mask_pix: QtGui.QPixmap = None, verbose: bool = True):
-        # returns a QPixmap mask (grayscale) highlighting defects, or None
-        def _dlog(msg: str):
-            if verbose:
-                self.log(msg)
-        qimg = pix.toImage()
-        gray = segmentation.qimage_to_gray_array(qimg)
-        seg_bin = None
-        # if segmentation mask provided, scale and apply it to restrict detection area
-        if isinstance(seg_mask_pix, QtGui.QPixmap):
-            seg_qimg = seg_mask_pix.toImage().scaled(
-                qimg.size(),
-                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                QtCore.Qt.TransformationMode.SmoothTransformation,
-            )
-            seg_arr = segmentation.qimage_to_gray_array(seg_qimg)
-            erode_px = int(self.defect_mask_erode.value()) if hasattr(self, 'defect_mask_erode') else 0
-            # Use the segmentation mask exactly as the ROI (match what the Segmentation overlay shows)
-            seg_bin = (seg_arr > 0).astype(np.uint8) * 255
-            try:
-                seg_area0 = int((seg_bin > 0).sum())
-            except Exception:
-                seg_area0 = 0
-            _dlog(f'Seg mask area (roi)={seg_area0}, erode_px={erode_px}')
-            if erode_px > 0:
-                try:
-                    seg_bin = cv2.erode(seg_bin, None, iterations=erode_px)
-                except Exception:
-                    pass
-            # Keep only the largest connected ROI component after erosion.
-            # IMPORTANT: do NOT use filled external contours here, because that would fill internal holes
-            # (including user exclusions). Use connected components so holes remain holes.
-            try:
-                cc_src = (seg_bin > 0).astype(np.uint8)
-                nlab, labels, stats, _ = cv2.connectedComponentsWithStats(cc_src, connectivity=8)
-                if nlab > 1:
-                    # skip background label 0
-                    areas = stats[1:, cv2.CC_STAT_AREA]
-                    best = 1 + int(np.argmax(areas))
-                    seg_bin = (labels == best).astype(np.uint8) * 255
-            except Exception:
-                pass
-            # if segmentation mask is empty after normalization/erosion, skip detection
-            if seg_bin is None or seg_bin.sum() == 0:
-                _dlog('Segmentation mask empty after erode — skipping detection for this unit')
-                return None
-        method = str(self.defect_method.currentText())
-        thr = int(self.defect_threshold.value())
-        if method == 'threshold':
-            # Local anomaly detection: threshold the absolute difference from a local median background.
-            # This is much more stable than a global gray threshold for spotting foreign material.
-            k = 21
-            if k % 2 == 0:
-                k += 1
-            bg = cv2.medianBlur(gray, k)
-            resid = cv2.absdiff(gray, bg)
-            _, mask = cv2.threshold(resid, thr, 255, cv2.THRESH_BINARY)
-            if seg_bin is not None:
-                mask = cv2.bitwise_and(mask, seg_bin)
-            # clean small pepper noise
-            try:
-                mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)), iterations=1)
-            except Exception:
-                pass
-            _dlog(f'Residual mask area={int((mask > 0).sum())}')
+    def _unit_arrays(self, pix: QtGui.QPixmap, seg_mask_pix: QtGui.QPixmap = None, row: int = None):
+        # Return (gray, seg_arr, owners) numpy views for a unit pixmap and its segmentation mask.
+        # `owners` holds the QImages backing the views; keep it alive while the arrays are used.
+        # With `row`, the unit is sliced from the cached full-image gray view instead of converting `pix`.
+        gray = None
+        if row is not None and 0 <= row < len(self.img_widget.grid_rects):
+            x, y, w, h = (int(v) for v in self.img_widget.grid_rects[row][0])
+            if (w, h) == (pix.width(), pix.height()):
+                gray = self.img_widget.gray_crop(x, y, w, h)
+        if gray is not None:
+            # the slice points into the widget's full-image view: pin its backing QImage too
+            owners = [self.img_widget._gray_owner]
         else:
-            mask = cv2.Canny(gray, max(1, thr//2), max(2, thr))
-            if seg_bin is not None:
-                mask = cv2.bitwise_and(mask, seg_bin)
-        cnts, _ = cv2.findContours(mask.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        mask2 = np.zeros_like(mask)
-        min_area = int(self.defect_min_area.value())
-        # allow very large defects, but reject "whole part" masks (shouldn't happen often with residual-based mask)
-        try:
-            seg_area = int((seg_bin > 0).sum()) if seg_bin is not None else int(gray.shape[0] * gray.shape[1])
-        except Exception:
-            seg_area = int(gray.shape[0] * gray.shape[1])
-        max_area = max(min_area, int(seg_area * 0.98))
-        _dlog(f'Defect area filter: min={min_area}, max={max_area}, seg_area={seg_area}')
-        found = False
-        for c in cnts:
-            a = cv2.contourArea(c)
-            if a >= min_area and a <= max_area:
-                cv2.drawContours(mask2, [c], -1, 255, -1)
-                found = True
-            else:
-                if a >= min_area:
-                    _dlog(f'Skipping large contour area={int(a)} (>max={max_area})')
-        if not found:
+            gray, gray_owner = segmentation.qimage_to_gray_view(pix.toImage())
+            owners = [gray_owner]
+        seg_arr = None
+        # if segmentation mask provided, scale it to the unit size to restrict detection area
+        if isinstance(seg_mask_pix, QtGui.QPixmap) and row is not None and seg_mask_pix.size() == pix.size():
+            seg_arr, _area = self._cached_seg_bin(row, seg_mask_pix)
+        elif isinstance(seg_mask_pix, QtGui.QPixmap):
+            seg_qimg = seg_mask_pix.toImage()
+            if seg_qimg.size() != pix.size():
+                seg_qimg = seg_qimg.scaled(
+                    pix.size(),
+                    QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
+                    QtCore.Qt.TransformationMode.SmoothTransformation,
+                )
+            seg_arr, seg_owner = segmentation.qimage_to_gray_view(seg_qimg)
+            owners.append(seg_owner)
+        return gray, seg_arr, owners
+
+    def _cached_seg_bin(self, row: int, seg_pm: QtGui.QPixmap):
+        # Return (seg_bin, area) for the segmentation mask of `row`: a uint8 0/255 array and its pixel count.
+        # Cached on the item under ROLE_BASE + 3 together with the mask pixmap's cacheKey, so a replaced
+        # mask (rerun, image switch, import) is re-derived. Callers must not modify the returned array.
+        item = self.thumb_list.item(row) if row is not None and 0 <= row < self.thumb_list.count() else None
+        key = seg_pm.cacheKey()
+        if item is not None:
+            cached = item.data(ROLE_BASE + 3)
+            if isinstance(cached, (tuple, list)) and len(cached) == 3 and cached[0] == key:
+                return cached[1], cached[2]
+        arr, _owner = segmentation.qimage_to_gray_view(seg_pm.toImage())
+        seg_bin = segmentation.binarize(arr)
+        area = int(cv2.countNonZero(seg_bin))
+        if item is not None:
+            item.setData(ROLE_BASE + 3, (key, seg_bin, area))
+        return seg_bin, area
+
+    def _defect_params(self) -> dict:
+        # current defect detection parameters as keyword args for segmentation.detect_defects
+        return {
+            'method': str(self.defect_method.currentText()),
+            'thr': int(self.defect_threshold.value()),
+            'min_area': int(self.defect_min_area.value()),
+            'erode_px': int(self.defect_mask_erode.value()) if hasattr(self, 'defect_mask_erode') else 0,
+            'background': str(self.defect_background.currentText()) if hasattr(self, 'defect_background') else 'box',
+        }
+
+    def _worker_pool(self):
+        # persistent thread pool for per-unit numpy/OpenCV work (reused across debounced reruns)
+        pool = getattr(self, '_pool', None)
+        if pool is None:
+            pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+            self._pool = pool
+        return pool
+
+    def _mask_to_pixmap(self, mask):
+        # convert a uint8 0/255 mask (or None) to a grayscale QPixmap (or None)
+        if mask is None:
             return None
-        h_m, w_m = mask2.shape
+        mask = np.ascontiguousarray(mask)
+        h_m, w_m = mask.shape
         bytes_per_line = w_m
-        # IMPORTANT: detach from temporary numpy/bytes buffer to avoid native crashes
+        # wrap the array buffer directly (no intermediate bytes object), then copy once:
+        # IMPORTANT: detach from the numpy buffer to avoid native crashes
         qimg_mask = QtGui.QImage(
-            mask2.data.tobytes(),
+            mask.data,
             w_m,
             h_m,
             bytes_per_line,
             QtGui.QImage.Format.Format_Grayscale8,
         ).copy()
-        pm_mask = QtGui.QPixmap.fromImage(qimg_mask)
+        return QtGui.QPixmap.fromImage(qimg_mask)
+
+    def _load_mask_as_pixmap(self, path, target_size=None, data=None):
+        # decode a mask PNG straight to 8-bit gray with OpenCV and resize it to the unit size if it differs
+        # (nearest keeps exported 0/255 masks binary); returns None if the file can't be read.
+        # `data` (encoded bytes, e.g. a masks.zip member) is decoded instead of reading `path`.
+        if data is not None:
+            m = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+        else:
+            m = _imread(path, cv2.IMREAD_GRAYSCALE)
+        if m is None:
+            return None
+        if target_size is not None:
+            tw, th = int(target_size.width()), int(target_size.height())
+            if tw > 0 and th > 0 and (m.shape[1], m.shape[0]) != (tw, th):
+                m = cv2.resize(m, (tw, th), interpolation=cv2.INTER_NEAREST)
+        return self._mask_to_pixmap(m)
+
+    def _detect_defects_on_pix(self, pix: QtGui.QPixmap, seg_mask_pix: QtGui.QPixmap = None, verbose: bool = True,
+                               return_area: bool = False, row: int = None):
+        # returns a QPixmap mask (grayscale) highlighting defects, or None
+        # (or (mask, area) when return_area is True, so callers don't have to re-read the pixmap)
+        gray, seg_arr, _owners = self._unit_arrays(pix, seg_mask_pix, row=row)
+        mask, area = segmentation.detect_defects(
+            gray,
+            seg_arr,
+            log=self.log if verbose else None,
+            **self._defect_params(),
+        )
+        pm_mask = self._mask_to_pixmap(mask)
+        if return_area:
+            return pm_mask, area
         return pm_mask
 
     def test_defect_detection_all(self):
-        # run defect detection on all thumbnails and update thumbnails/icons
+        # run defect detection on all thumbnails and update the stored defect masks
         try:
             if getattr(self.img_widget, 'inspection_mode', False):
                 if hasattr(self, 'run_insp_btn') and self.run_insp_btn is not None:
@@ -1581,6 +2011,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.exit_inspection_mode(force_overlay_mode='Both')
         except Exception:
             pass
+        if self._defect_batch is not None:
+            self.statusBar().showMessage('Defect detection is already running', 2000)
+            return
         count = self.thumb_list.count()
         if count == 0:
             QtWidgets.QMessageBox.information(self, 'Info', 'No units available.')
@@ -1592,7 +2025,12 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.overlay_mode.setCurrentText('Both')
         except Exception:
             pass
-        processed = 0
+        params = self._defect_params()
+        # Units are independent: extract numpy views on the GUI thread (QPixmap is not thread-safe),
+        # run the numpy/OpenCV pipeline on a thread pool (cv2 releases the GIL), then apply results here.
+        futures = {}
+        units = []
+        pool = self._worker_pool()
         for row in range(count):
             item = self.thumb_list.item(row)
             pix = item.data(ROLE_BASE)
@@ -1603,25 +2041,73 @@ class MainWindow(QtWidgets.QMainWindow):
             if not isinstance(seg_mask_pm, QtGui.QPixmap):
                 self.log(f'Unit {row}: no segmentation mask, skipping')
                 continue
-            pm_mask = self._detect_defects_on_pix(pix, seg_mask_pm)
-            # store (or clear) defect mask; icons will be refreshed for all items after the loop
+            gray, seg_arr, owners = self._unit_arrays(pix, seg_mask_pm, row=row)
+            units.append((row, gray, seg_arr, owners))
+        # background filter for all units in one OpenCV call over a tiled atlas
+        bgs = [None] * len(units)
+        if params['method'] == 'threshold' and units:
+            with _cv_all_threads():
+                bgs = segmentation.estimate_background_batch([u[1] for u in units], 21, params['background'])
+        for (row, gray, seg_arr, owners), bg in zip(units, bgs):
+            # worker log lines are buffered and written from the GUI thread
+            msgs = []
+            fut = pool.submit(segmentation.detect_defects, gray, seg_arr, bg=bg, log=msgs.append, **params)
+            futures[row] = (fut, msgs, owners)
+        # results are applied in row order by _drain_defect_batch while the event loop keeps running
+        self._defect_batch = {
+            'jobs': list(futures.items()),
+            'pos': 0,
+            'params': params,
+            'count': count,
+            'processed': 0,
+            'grid': self.img_widget.grid_rects,
+            'image': getattr(self, '_current_image_path', None),
+        }
+        self._defect_batch_timer.start()
+
+    def _drain_defect_batch(self):
+        # Apply finished batch defect results (GUI thread only: QPixmap/item updates), in row order.
+        batch = self._defect_batch
+        if batch is None:
+            self._defect_batch_timer.stop()
+            return
+        # the grid/thumbnails were rebuilt meanwhile (re-index, image switch): rows no longer match
+        if (self.img_widget.grid_rects is not batch['grid'] or self.thumb_list.count() != batch['count']
+                or getattr(self, '_current_image_path', None) != batch['image']):
+            for _row, (fut, _msgs, _owners) in batch['jobs'][batch['pos']:]:
+                fut.cancel()
+            self._defect_batch = None
+            self._defect_batch_timer.stop()
+            self.log('Defect detection cancelled: units changed while it was running')
+            self.statusBar().showMessage('Defect detection cancelled', 3000)
+            return
+        params = batch['params']
+        jobs = batch['jobs']
+        while batch['pos'] < len(jobs) and jobs[batch['pos']][1][0].done():
+            row, (fut, msgs, _owners) = jobs[batch['pos']]
+            batch['pos'] += 1
+            mask, area = fut.result()
+            for m in msgs:
+                self.log(m)
+            pm_mask = self._mask_to_pixmap(mask)
+            item = self.thumb_list.item(row)
+            # store (or clear) defect mask; canvas overlays are refreshed for all units after the loop
             item.setData(ROLE_BASE + 2, pm_mask if isinstance(pm_mask, QtGui.QPixmap) else None)
             if pm_mask:
-                # compute area and verdict and log
-                try:
-                    qim = pm_mask.toImage()
-                    arr = segmentation.qimage_to_gray_array(qim)
-                    stats = segmentation.mask_stats(arr)
-                    area = stats['area']
-                except Exception:
-                    area = 0
-                verdict = 'NG' if area >= int(self.defect_min_area.value()) else 'OK'
+                # verdict and log
+                verdict = 'NG' if area >= int(params['min_area']) else 'OK'
                 self.log(f'Unit {row}: defect area={area} px -> {verdict}')
-                processed += 1
+                batch['processed'] += 1
             else:
                 self.log(f'Unit {row}: no defects')
-        # show overlays on ALL thumbnails according to the current overlay mode
-        self.refresh_thumbnail_icons()
+        if batch['pos'] < len(jobs):
+            self.statusBar().showMessage(f'Running defect detection on all units... {batch["pos"]}/{len(jobs)}')
+            return
+        self._defect_batch = None
+        self._defect_batch_timer.stop()
+        processed = batch['processed']
+        count = batch['count']
+        # show overlays on ALL units according to the current overlay mode
         self.refresh_canvas_overlays()
         self.statusBar().showMessage(f'Defect detection completed: {processed}/{count} units had detections', 4000)
         # ensure something is selected so the main view shows overlays immediately
@@ -1679,7 +2165,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 # no data => leave as unknown (no marker)
                 continue
 
-            pm_mask = self._detect_defects_on_pix(pix, seg_mask_pm, verbose=False)
+            pm_mask, area = self._detect_defects_on_pix(pix, seg_mask_pm, verbose=False, return_area=True, row=row)
             # store defect mask so returning to overlay view is instant
             item.setData(ROLE_BASE + 2, pm_mask if isinstance(pm_mask, QtGui.QPixmap) else None)
 
@@ -1687,15 +2173,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 results[grid_idx] = False
                 continue
 
-            # compute area and verdict like the existing "Test" flow
-            try:
-                qim = pm_mask.toImage()
-                arr = segmentation.qimage_to_gray_array(qim)
-                stats = segmentation.mask_stats(arr)
-                area = int(stats.get('area', 0))
-            except Exception:
-                area = 0
-
+            # verdict like the existing "Test" flow
             is_ng = area >= min_area
             results[grid_idx] = bool(is_ng)
             if is_ng:
@@ -2121,13 +2599,8 @@ class MainWindow(QtWidgets.QMainWindow):
             self._ensure_image_registered(path, switch_to=True)
             # If no reference image yet, make this the reference/original.
             if self._reference_image_path is None:
+                # its size is taken from the decoded image when the switch completes
                 self._reference_image_path = path
-                try:
-                    arr = cv2.imread(path, cv2.IMREAD_UNCHANGED)
-                    if arr is not None:
-                        self._reference_image_size = (int(arr.shape[1]), int(arr.shape[0]))
-                except Exception:
-                    pass
             self._switch_to_image(path)
 
     def apply_indexing(self):
@@ -2168,8 +2641,14 @@ class MainWindow(QtWidgets.QMainWindow):
         QtWidgets.QMessageBox.information(self, 'Done', f'Generated {count} unit bounding boxes. Editing locked.')
         return
 
+    def schedule_grid_preview(self, *_):
+        # Debounce rapid indexing parameter changes into a single update_grid_preview()
+        self._grid_preview_timer.start()
+
     def update_grid_preview(self):
         # generate grid from current parameters; returns count
+        # a direct call supersedes any pending debounced one
+        self._grid_preview_timer.stop()
         if not self.img_widget.fixed_img_rect or not self.img_widget.image:
             return 0
         r = self.img_widget.fixed_img_rect
@@ -2179,16 +2658,12 @@ class MainWindow(QtWidgets.QMainWindow):
         sbx = self.block_space_x.value(); sby = self.block_space_y.value()
 
         unit_w = r.width(); unit_h = r.height()
-        grid = []
-        idx = 0
-        for byi in range(by):
-            for uyi in range(uy):
-                for bxi in range(bx):
-                    for uxi in range(ux):
-                        x = r.x() + bxi * (ux * unit_w + (ux - 1) * sux + sbx) + uxi * (unit_w + sux)
-                        y = r.y() + byi * (uy * unit_h + (uy - 1) * suy + sby) + uyi * (unit_h + suy)
-                        grid.append(((int(x), int(y), int(unit_w), int(unit_h)), idx))
-                        idx += 1
+        # cell origins are affine in (block y, unit y, block x, unit x); index order is that nesting order
+        byi, uyi, bxi, uxi = np.meshgrid(np.arange(by), np.arange(uy), np.arange(bx), np.arange(ux), indexing='ij')
+        xs = (r.x() + bxi * (ux * unit_w + (ux - 1) * sux + sbx) + uxi * (unit_w + sux)).ravel().tolist()
+        ys = (r.y() + byi * (uy * unit_h + (uy - 1) * suy + sby) + uyi * (unit_h + suy)).ravel().tolist()
+        unit_w = int(unit_w); unit_h = int(unit_h)
+        grid = [((x, y, unit_w, unit_h), idx) for idx, (x, y) in enumerate(zip(xs, ys))]
 
         self.img_widget.grid_rects = grid
         self.img_widget.update()
@@ -2220,11 +2695,12 @@ class MainWindow(QtWidgets.QMainWindow):
                 ref_masks = st.get('seg') or []
                 if ref_masks:
                     ref_seg_bins = {}
-                    for i, pm in enumerate(ref_masks):
-                        if not isinstance(pm, QtGui.QPixmap):
+                    for i, q in enumerate(ref_masks):
+                        if isinstance(q, QtGui.QPixmap):
+                            q = q.toImage()
+                        if not isinstance(q, QtGui.QImage) or q.isNull():
                             continue
                         try:
-                            q = pm.toImage()
                             arr = segmentation.qimage_to_gray_array(q)
                             ref_seg_bins[i] = (arr > 0).astype(np.uint8) * 255
                         except Exception:
@@ -2236,16 +2712,14 @@ class MainWindow(QtWidgets.QMainWindow):
             if bin_mask is None or bin_mask.size == 0:
                 return None
             try:
-                src = (bin_mask > 0).astype(np.uint8)
-                nlab, labels, stats, _ = cv2.connectedComponentsWithStats(src, connectivity=8)
+                # any non-zero pixel is foreground for connectedComponents, so no binarized copy is needed;
+                # the returned centroids are the per-label pixel-coordinate means (no label==best scan)
+                nlab, _labels, stats, centroids = cv2.connectedComponentsWithStats(bin_mask, connectivity=8)
                 if nlab <= 1:
                     return None
                 areas = stats[1:, cv2.CC_STAT_AREA]
                 best = 1 + int(np.argmax(areas))
-                ys, xs = np.where(labels == best)
-                if xs.size == 0:
-                    return None
-                return (float(xs.mean()), float(ys.mean()))
+                return (float(centroids[best, 0]), float(centroids[best, 1]))
             except Exception:
                 try:
                     ys, xs = np.where(bin_mask > 0)
@@ -2264,40 +2738,74 @@ class MainWindow(QtWidgets.QMainWindow):
             except Exception:
                 pass
 
-        # iterate thumbnails and compute masks
-        for idx, (r, _) in enumerate(self.img_widget.grid_rects):
-            x, y, w, h = int(r[0]), int(r[1]), int(r[2]), int(r[3])
-            qimg_crop = self.img_widget.image.copy(x, y, w, h)
-            gray = segmentation.qimage_to_gray_array(qimg_crop)
-            method = str(self.seg_method.currentText())
-            mask = segmentation.segment_cell(gray, method=method,
-                                             adapt_block=self.adapt_block.value(),
-                                             adapt_C=self.adapt_C.value(),
-                                             gaussian_blur=self.gauss_spin.value(),
-                                             morph_kernel=self.morph_spin.value())
-
-            # Pre-exclusion mask used for alignment anchors.
-            pre_excl_bin = (mask > 0).astype(np.uint8) * 255
-
-            # If this is the reference image, record the reference centroid for this unit.
-            if is_reference:
+        # snapshot everything the workers need on the GUI thread (widgets/QImage are not thread-safe)
+        method = str(self.seg_method.currentText())
+        seg_params = dict(adapt_block=self.adapt_block.value(),
+                          adapt_C=self.adapt_C.value(),
+                          gaussian_blur=self.gauss_spin.value(),
+                          morph_kernel=self.morph_spin.value())
+        # normalize exclusions once (ints, disk stencils for circles); malformed entries are skipped
+        exclusions = []
+        for excl in list(getattr(self, 'exclusions', []) or []):
+            try:
+                if excl.get('shape') == 'rect':
+                    exclusions.append(('rect', int(excl.get('x', 0)), int(excl.get('y', 0)),
+                                       int(excl.get('w', 0)), int(excl.get('h', 0))))
+                else:
+                    # circle
+                    cr = int(excl.get('r', 0))
+                    if cr > 0:
+                        yy, xx = np.ogrid[-cr:cr + 1, -cr:cr + 1]
+                        disk = xx * xx + yy * yy <= cr * cr
+                        exclusions.append(('circle', int(excl.get('cx', 0)), int(excl.get('cy', 0)), cr, disk))
+            except Exception:
+                # be resilient to malformed exclusion entries
+                continue
+        ref_centroids = dict(getattr(self, '_exclusion_ref_centroids', {}) or {})
+
+        # Pre-exclusion masks (and their centroids) only depend on the image, the unit rect and the
+        # segmentation parameters, so they are memoized per image for the last few parameter sets.
+        # Exclusion edits and parameter sweeps back to earlier values then skip segment_cell entirely.
+        img_key = self.img_widget.image.cacheKey()
+        if getattr(self, '_seg_cache_image', None) != img_key:
+            self._seg_cache = {}
+            self._seg_cache_image = img_key
+        params_key = (method, tuple(sorted(seg_params.items())))
+        seg_cache = self._seg_cache.pop(params_key, None) or {}
+        self._seg_cache[params_key] = seg_cache  # most recently used last
+        while len(self._seg_cache) > 4:
+            del self._seg_cache[next(iter(self._seg_cache))]
+
+        def _segment_one(idx, rect, gray, w, h, prev):
+            # pure numpy/OpenCV work for one unit; returns (mask, reference centroid or None, changed)
+            hit = seg_cache.get(rect)
+            if hit is None:
+                pre = segmentation.segment_cell(gray, method=method, **seg_params)
+                # Pre-exclusion mask (0/255) centroid used for alignment anchors.
                 try:
-                    c_ref = _largest_component_centroid(pre_excl_bin)
-                    if c_ref is not None:
-                        self._exclusion_ref_centroids[int(idx)] = (float(c_ref[0]), float(c_ref[1]))
+                    c_pre = _largest_component_centroid(pre)
                 except Exception:
-                    pass
+                    c_pre = None
+                hit = (pre, c_pre)
+                seg_cache[rect] = hit
+            pre, c_pre = hit
+            # exclusions are stamped into a copy so the cached mask stays untouched;
+            # without exclusions the cached mask is shared read-only (QImage/ROI consumers copy or only read)
+            mask = pre.copy() if exclusions else pre
+
+            # If this is the reference image, record the reference centroid for this unit.
+            c_ref = c_pre if is_reference else None
 
             # Estimate per-unit XY shift vs reference (based on segmentation ROI centroid) so exclusions track the mold.
             dx = 0
             dy = 0
             if not is_reference:
                 try:
-                    c1 = _largest_component_centroid(pre_excl_bin)
+                    c1 = c_pre
                     c0 = None
                     # Prefer persisted reference centroids (works even if reference segmentation isn't loaded now).
                     try:
-                        rc = self._exclusion_ref_centroids.get(int(idx))
+                        rc = ref_centroids.get(int(idx))
                         if rc is not None:
                             c0 = (float(rc[0]), float(rc[1]))
                     except Exception:
@@ -2314,52 +2822,68 @@ class MainWindow(QtWidgets.QMainWindow):
                     dy = 0
 
             # apply any user-defined exclusions (relative to unit; shifted by dx/dy)
-            for excl in getattr(self, 'exclusions', []):
-                try:
-                    if excl.get('shape') == 'rect':
-                        ex = int(excl.get('x', 0)) + dx
-                        ey = int(excl.get('y', 0)) + dy
-                        ew = int(excl.get('w', 0)); eh = int(excl.get('h', 0))
-                        x0 = max(0, ex); y0 = max(0, ey)
-                        x1 = min(w, ex + ew); y1 = min(h, ey + eh)
-                        if x1 > x0 and y1 > y0:
-                            mask[y0:y1, x0:x1] = 0
-                    else:
-                        # circle
-                        cx = int(excl.get('cx', 0)) + dx
-                        cy = int(excl.get('cy', 0)) + dy
-                        r = int(excl.get('r', 0))
-                        if r > 0:
-                            yy, xx = np.ogrid[:h, :w]
-                            circle = (xx - cx) ** 2 + (yy - cy) ** 2 <= (r ** 2)
-                            mask[circle] = 0
-                except Exception:
-                    # be resilient to malformed exclusion entries
-                    continue
-            # convert mask to QPixmap (image-size)
-            h_m, w_m = mask.shape
-            bytes_per_line = w_m
-            # IMPORTANT: detach from temporary numpy/bytes buffer to avoid native crashes
-            qimg_mask = QtGui.QImage(
-                mask.data.tobytes(),
-                w_m,
-                h_m,
-                bytes_per_line,
-                QtGui.QImage.Format.Format_Grayscale8,
-            ).copy()
-            pm_mask = QtGui.QPixmap.fromImage(qimg_mask)
+            for excl in exclusions:
+                if excl[0] == 'rect':
+                    _, ex, ey, ew, eh = excl
+                    ex += dx; ey += dy
+                    x0 = max(0, ex); y0 = max(0, ey)
+                    x1 = min(w, ex + ew); y1 = min(h, ey + eh)
+                    if x1 > x0 and y1 > y0:
+                        mask[y0:y1, x0:x1] = 0
+                else:
+                    # circle: stamp the precomputed disk stencil, clipped to the unit
+                    _, cx, cy, cr, disk = excl
+                    sx = cx + dx - cr; sy = cy + dy - cr
+                    x0 = max(0, sx); y0 = max(0, sy)
+                    x1 = min(w, sx + 2 * cr + 1); y1 = min(h, sy + 2 * cr + 1)
+                    if x1 > x0 and y1 > y0:
+                        mask[y0:y1, x0:x1][disk[y0 - sy:y1 - sy, x0 - sx:x1 - sx]] = 0
+            # an exclusion edit usually only changes the units it actually cuts into; the rest keep their pixmaps
+            changed = prev is None or prev.shape != mask.shape or not np.array_equal(prev, mask)
+            return mask, c_ref, changed
+
+        # unit crops are slices of one cached gray view of the whole image (no per-unit QImage copies)
+        futures = []
+        pool = self._worker_pool()
+        n_items = self.thumb_list.count()
+        for idx, (r, _) in enumerate(self.img_widget.grid_rects):
+            x, y, w, h = int(r[0]), int(r[1]), int(r[2]), int(r[3])
+            gray = self.img_widget.gray_crop(x, y, w, h)
+            if gray is None:
+                # unit partly outside the image: keep QImage.copy() semantics (zero fill)
+                gray = segmentation.qimage_to_gray_array(self.img_widget.image.copy(x, y, w, h))
+            # the unit's current mask, if it is still the one stored as its segmentation pixmap
+            prev = None
+            if idx < n_items:
+                item = self.thumb_list.item(idx)
+                roi = item.data(ROLE_BASE + 3)
+                seg_pm = item.data(ROLE_BASE + 1)
+                if (isinstance(roi, tuple) and len(roi) == 3 and isinstance(roi[1], np.ndarray)
+                        and isinstance(seg_pm, QtGui.QPixmap) and seg_pm.cacheKey() == roi[0]):
+                    prev = roi[1]
+            futures.append((idx, pool.submit(_segment_one, idx, (x, y, w, h), gray, w, h, prev)))
+
+        # Qt objects are built and stored on the GUI thread, in grid order
+        for idx, fut in futures:
+            mask, c_ref, changed = fut.result()
+            if is_reference and c_ref is not None:
+                self._exclusion_ref_centroids[int(idx)] = (float(c_ref[0]), float(c_ref[1]))
+            if not changed:
+                continue
+            pm_mask = self._mask_to_pixmap(mask)
             # store full-resolution mask in corresponding thumbnail item if exists
             # find thumbnail item by index
             if idx < self.thumb_list.count():
                 item = self.thumb_list.item(idx)
                 item.setData(ROLE_BASE + 1, pm_mask)
-                # thumbnail icons are refreshed after the loop according to overlay mode
+                # segment_cell masks are already 0/255: cache them as the ROI for defects/erosion outline
+                item.setData(ROLE_BASE + 3, (pm_mask.cacheKey(), mask, int(cv2.countNonZero(mask))))
+                # canvas overlays are refreshed after the loop according to overlay mode
             # if this cell is currently selected, update main overlay
             if self.img_widget.selected_cell_index == idx:
                 # refresh selected overlay according to current mode
                 self.update_selected_overlay(idx)
         # repaint main image to show overlays if any
-        self.refresh_thumbnail_icons()
         self.refresh_canvas_overlays()
         self.img_widget.update()
         self.statusBar().showMessage('Segmentation completed', 2000)
@@ -2368,7 +2892,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self._snapshot_current_results()
 
     def on_overlay_mode_changed(self, *_):
-        # update selected overlay and all thumbnail icons
+        # update selected overlay and the canvas overlays
         # If the user picks an overlay mode, leave inspection mode.
         try:
             if getattr(self.img_widget, 'inspection_mode', False):
@@ -2377,11 +2901,12 @@ class MainWindow(QtWidgets.QMainWindow):
         except Exception:
             pass
         self.update_selected_overlay()
-        self.refresh_thumbnail_icons()
         self.refresh_canvas_overlays()
 
     def refresh_canvas_overlays(self):
         # Build tinted per-cell overlays for drawing on the full image canvas.
+        # The canvas draws them without painter opacity, so the 0.55 canvas opacity is baked into alpha.
+        # Masks are binary, so overlays are kept as 1-bit images; only the composited canvas layer is 32-bit.
         overlays = {}
         for row in range(self.thumb_list.count()):
             item = self.thumb_list.item(row)
@@ -2394,9 +2919,9 @@ class MainWindow(QtWidgets.QMainWindow):
             seg_t = None
             defect_t = None
             if isinstance(seg_pm, QtGui.QPixmap):
-                seg_t = self._tint_mask_pixmap(seg_pm, color=(0, 255, 0), alpha_val=140)
+                seg_t = self._tint_mask_mono(seg_pm, color=(0, 255, 0), alpha_val=int(140 * 0.55))
             if isinstance(defect_pm, QtGui.QPixmap):
-                defect_t = self._tint_mask_pixmap(defect_pm, color=(255, 0, 0), alpha_val=180)
+                defect_t = self._tint_mask_mono(defect_pm, color=(255, 0, 0), alpha_val=int(180 * 0.55))
             overlays[grid_idx] = {'seg': seg_t, 'defect': defect_t}
         self.img_widget.cell_overlays = overlays
         try:
@@ -2405,91 +2930,64 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
         self.img_widget.update()
 
-    def refresh_thumbnail_icons(self, mode_override: str = None):
-        # Update ALL thumbnail icons according to current overlay mode (or an override) and stored masks.
-        mode = str(mode_override) if mode_override else (str(self.overlay_mode.currentText()) if hasattr(self, 'overlay_mode') else 'Segmentation')
-        for i in range(self.thumb_list.count()):
-            item = self.thumb_list.item(i)
-            base_pm = item.data(ROLE_BASE)
-            if not isinstance(base_pm, QtGui.QPixmap):
-                continue
-            base_disp = base_pm.scaled(
-                128,
-                128,
-                QtCore.Qt.AspectRatioMode.KeepAspectRatio,
-                QtCore.Qt.TransformationMode.SmoothTransformation,
-            )
-            seg_pm = item.data(ROLE_BASE + 1)
-            defect_pm = item.data(ROLE_BASE + 2)
-
-            if mode == 'None':
-                item.setIcon(QtGui.QIcon(base_disp))
-                continue
-
-            out = base_disp
-            if mode in ('Segmentation', 'Both') and isinstance(seg_pm, QtGui.QPixmap):
-                seg_scaled = seg_pm.scaled(
-                    base_disp.size(),
-                    QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                    QtCore.Qt.TransformationMode.SmoothTransformation,
-                )
-                out = self._make_overlay_pixmap(out, seg_scaled, color=(0, 255, 0))
-            if mode in ('Defect', 'Both') and isinstance(defect_pm, QtGui.QPixmap):
-                defect_scaled = defect_pm.scaled(
-                    base_disp.size(),
-                    QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                    QtCore.Qt.TransformationMode.SmoothTransformation,
-                )
-                out = self._make_overlay_pixmap(out, defect_scaled, color=(255, 0, 0))
-
-            item.setIcon(QtGui.QIcon(out))
-
-    def _make_overlay_pixmap(self, pix, mask_pix, color=(255, 0, 0), alpha_val=200):
-        # overlay mask (colored) on cell pixmap
-        base = QtGui.QPixmap(pix)
-        mask = QtGui.QPixmap(mask_pix)
-        # ensure same size
-        mask = mask.scaled(
-            base.size(),
-            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-            QtCore.Qt.TransformationMode.SmoothTransformation,
-        )
-        result = QtGui.QPixmap(base.size())
-        result.fill(QtCore.Qt.GlobalColor.transparent)
-        p = QtGui.QPainter(result)
-        p.drawPixmap(0, 0, base)
-        p.setOpacity(0.5)
-        # tint mask with requested color
-        tinted = self._tint_mask_pixmap(mask, color=color, alpha_val=alpha_val)
-        p.drawPixmap(0, 0, tinted)
-        p.end()
-        return result
+    @contextlib.contextmanager
+    def _thumb_list_batch(self, data_only: bool = False):
+        # suspend signals of thumb_list while many items are added/changed.
+        # data_only: rows are only setData'd (not added/removed), so the model's per-item dataChanged is
+        # silenced too and replaced by one dataChanged over all rows at the end.
+        prev_blocked = self.thumb_list.blockSignals(True)
+        model = self.thumb_list.model()
+        prev_model_blocked = model.blockSignals(True) if data_only else None
+        try:
+            yield
+        finally:
+            if data_only:
+                model.blockSignals(prev_model_blocked)
+                n = model.rowCount()
+                if n:
+                    model.dataChanged.emit(model.index(0, 0), model.index(n - 1, 0))
+            self.thumb_list.blockSignals(prev_blocked)
 
     def _tint_mask_pixmap(self, mask_pix, color=(255, 0, 0), alpha_val=200):
         # create a colored ARGB pixmap where mask non-zero pixels get the given color and alpha
-        mask = QtGui.QPixmap(mask_pix)
-        mask_img = mask.toImage().convertToFormat(QtGui.QImage.Format.Format_ARGB32)
-        h = mask_img.height(); w = mask_img.width()
-        bits = mask_img.bits()
-        bc = getattr(mask_img, "sizeInBytes", None)
-        bc = bc() if callable(bc) else mask_img.byteCount()
-        bits.setsize(int(bc))
-        arr = np.frombuffer(bits, np.uint8).reshape((h, w, 4))
-        mask_alpha = (arr[:, :, 0] > 0).astype(np.uint8) * alpha_val
-        out_img = QtGui.QImage(w, h, QtGui.QImage.Format.Format_ARGB32)
-        out_img.fill(0)
-        ob = out_img.bits()
-        bc2 = getattr(out_img, "sizeInBytes", None)
-        bc2 = bc2() if callable(bc2) else out_img.byteCount()
-        ob.setsize(int(bc2))
-        oarr = np.frombuffer(ob, np.uint8).reshape((h, w, 4))
+        # (memoized in QPixmapCache by mask identity, color and alpha)
+        tint_key = f'tint:{mask_pix.cacheKey()}:{tuple(color)}:{alpha_val}'
+        cached = QtGui.QPixmapCache.find(tint_key)
+        if cached is not None and not cached.isNull():
+            return cached
+        tinted = self._tint_mask_pixmap_uncached(mask_pix, color=color, alpha_val=alpha_val)
+        QtGui.QPixmapCache.insert(tint_key, tinted)
+        return tinted
+
+    def _tint_mask_pixmap_uncached(self, mask_pix, color=(255, 0, 0), alpha_val=200):
+        # read the mask as 1-byte gray (not ARGB32) and write premultiplied BGRA in one masked assignment
+        # (Qt's raster engine blends ARGB32_Premultiplied directly; plain ARGB32 is converted on every draw)
+        gray, _owner = segmentation.qimage_to_gray_view(QtGui.QPixmap(mask_pix).toImage())
+        h, w = gray.shape
+        oarr = np.zeros((h, w, 4), dtype=np.uint8)
         # assign color (B,G,R order in QImage byte layout)
-        oarr[:, :, 0] = color[2] if len(color) >= 3 else 0
-        oarr[:, :, 1] = color[1] if len(color) >= 2 else 0
-        oarr[:, :, 2] = color[0] if len(color) >= 1 else 0
-        oarr[:, :, 3] = mask_alpha
-        # Detach underlying buffer before Qt starts painting it
-        return QtGui.QPixmap.fromImage(out_img.copy())
+        bgra = (
+            color[2] if len(color) >= 3 else 0,
+            color[1] if len(color) >= 2 else 0,
+            color[0] if len(color) >= 1 else 0,
+            alpha_val,
+        )
+        oarr[gray > 0] = _premultiplied(bgra)
+        # QImage over the numpy buffer, detached before Qt starts painting it
+        out_img = QtGui.QImage(oarr.data, w, h, w * 4, QtGui.QImage.Format.Format_ARGB32_Premultiplied).copy()
+        return QtGui.QPixmap.fromImage(out_img)
+
+    def _tint_mask_mono(self, mask_pix, color=(255, 0, 0), alpha_val=200):
+        # 1-bit version of _tint_mask_pixmap: non-zero mask pixels map to colour index 1 (tint), the rest to 0 (transparent)
+        gray, _owner = segmentation.qimage_to_gray_view(mask_pix.toImage())
+        h, w = gray.shape
+        # Format_Mono is MSB-first like np.packbits; pad rows to 32 bits
+        bpl = ((w + 31) // 32) * 4
+        packed = np.zeros((h, bpl), dtype=np.uint8)
+        packed[:, :(w + 7) // 8] = np.packbits(gray > 0, axis=1)
+        img = QtGui.QImage(packed.data, w, h, bpl, QtGui.QImage.Format.Format_Mono).copy()
+        img.setColorTable([QtGui.qRgba(0, 0, 0, 0), QtGui.qRgba(color[0], color[1], color[2], alpha_val)])
+        return img
 
     def _combine_mask_pixmaps(self, seg_mask_pix, defect_mask_pix):
         # return a single ARGB pixmap combining seg (green) and defect (red) masks
@@ -2498,20 +2996,45 @@ class MainWindow(QtWidgets.QMainWindow):
         # prefer seg size if available
         ref = seg_mask_pix if isinstance(seg_mask_pix, QtGui.QPixmap) else defect_mask_pix
         base_size = ref.size()
-        seg_t = None
-        defect_t = None
-        if isinstance(seg_mask_pix, QtGui.QPixmap):
-            seg_t = self._tint_mask_pixmap(seg_mask_pix.scaled(base_size), color=(0, 255, 0), alpha_val=160)
-        if isinstance(defect_mask_pix, QtGui.QPixmap):
-            defect_t = self._tint_mask_pixmap(defect_mask_pix.scaled(base_size), color=(255, 0, 0), alpha_val=200)
-        result = QtGui.QPixmap(base_size)
-        result.fill(QtCore.Qt.GlobalColor.transparent)
-        p = QtGui.QPainter(result)
-        if seg_t:
-            p.drawPixmap(0, 0, seg_t)
-        if defect_t:
-            p.drawPixmap(0, 0, defect_t)
-        p.end()
+        seg_ok = isinstance(seg_mask_pix, QtGui.QPixmap)
+        defect_ok = isinstance(defect_mask_pix, QtGui.QPixmap)
+        combo_key = 'combine:{}:{}'.format(seg_mask_pix.cacheKey() if seg_ok else 0,
+                                           defect_mask_pix.cacheKey() if defect_ok else 0)
+        cached = QtGui.QPixmapCache.find(combo_key)
+        if cached is not None and not cached.isNull():
+            return cached
+
+        def _hits(pm):
+            if pm.size() != base_size:
+                pm = pm.scaled(base_size)
+            gray, _owner = segmentation.qimage_to_gray_view(pm.toImage())
+            return gray > 0
+
+        w, h = base_size.width(), base_size.height()
+        # BGRA (QImage ARGB32 byte order): seg green@160 under defect red@200, composited SourceOver
+        green = _premultiplied((0, 255, 0, 160))
+        red = _premultiplied((0, 0, 255, 200))
+        a_top, a_bot = 200 / 255.0, 160 / 255.0
+        a_out = a_top + a_bot * (1.0 - a_top)
+        both = _premultiplied((
+            0,
+            round(255 * a_bot * (1.0 - a_top) / a_out),
+            round(255 * a_top / a_out),
+            round(255 * a_out),
+        ))
+        out = np.zeros((h, w, 4), dtype=np.uint8)
+        seg_hit = _hits(seg_mask_pix) if seg_ok else None
+        defect_hit = _hits(defect_mask_pix) if defect_ok else None
+        if seg_hit is not None:
+            out[seg_hit] = green
+        if defect_hit is not None:
+            out[defect_hit] = red
+            if seg_hit is not None:
+                out[seg_hit & defect_hit] = both
+        # QImage over the numpy buffer, detached before Qt starts painting it
+        result = QtGui.QPixmap.fromImage(
+            QtGui.QImage(out.data, w, h, w * 4, QtGui.QImage.Format.Format_ARGB32_Premultiplied).copy())
+        QtGui.QPixmapCache.insert(combo_key, result)
         return result
 
     def update_selected_overlay(self, row: int = None):
@@ -2566,38 +3089,53 @@ class MainWindow(QtWidgets.QMainWindow):
             self.img_widget.erosion_path = path
             self.img_widget.update()
             return
-        # convert segmentation pixmap to binary ROI exactly as stored (match Segmentation overlay)
-        qimg = seg_pm.toImage()
-        seg_arr = segmentation.qimage_to_gray_array(qimg)
-        seg_bin = (seg_arr > 0).astype(np.uint8) * 255
         erode_px = int(self.defect_mask_erode.value()) if hasattr(self, 'defect_mask_erode') else 0
-        try:
-            seg_area0 = int((seg_bin > 0).sum())
-        except Exception:
-            seg_area0 = 0
+        # the outline only depends on the mask, the unit origin and erode_px: reuse it (zoom/fit, reselect,
+        # spinbox scrubbing back to a previous value) instead of re-eroding and re-tracing
+        r, idx = self.img_widget.grid_rects[row]
+        outline_key = (seg_pm.cacheKey(), int(r[0]), int(r[1]), erode_px)
+        cached = item.data(ROLE_BASE + 4)
+        if isinstance(cached, dict) and outline_key in cached:
+            self.img_widget.erosion_path = cached[outline_key]
+            self.img_widget.update()
+            return
+        cached = {k: v for k, v in cached.items() if k[0] == outline_key[0]} if isinstance(cached, dict) else {}
+        path = self._erosion_outline_path(row, seg_pm, erode_px)
+        cached[outline_key] = path
+        while len(cached) > 16:
+            cached.pop(next(iter(cached)))
+        item.setData(ROLE_BASE + 4, cached)
+        self.img_widget.erosion_path = path
+        self.img_widget.update()
+
+    def _erosion_outline_path(self, row: int, seg_pm: QtGui.QPixmap, erode_px: int):
+        # image-space QPainterPath of the largest region of the eroded segmentation mask, or None
+        # binary ROI exactly as stored (match Segmentation overlay), cached per mask on the item
+        seg_bin, seg_area0 = self._cached_seg_bin(row, seg_pm)
         # avoid spamming the log on every slider move; uncomment if you need debug output
         # self.log(f'Erosion outline roi_area={seg_area0}, erode_px={erode_px}')
         # erode by user parameter (in pixels)
         if erode_px > 0:
             try:
-                seg_bin = cv2.erode(seg_bin, None, iterations=erode_px)
+                seg_bin = segmentation.erode_mask(seg_bin, erode_px)
             except Exception:
                 pass
-        # find contours on eroded mask (unit-local coords) and keep only the largest
-        cnts, _ = cv2.findContours(seg_bin.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not cnts:
-            self.img_widget.erosion_path = None
-            self.img_widget.update()
-            return
-        try:
-            cnts = [max(cnts, key=cv2.contourArea)]
-        except Exception:
-            pass
-        # build QPainterPath in IMAGE coordinates by mapping unit-local points to absolute image coords
-        path = QtGui.QPainterPath()
-        # unit top-left in image coords
+        # keep only the largest region: label once (O(pixels)), then trace just that component inside its
+        # bounding box instead of tracing every speck and comparing contour areas
+        n, labels, stats, _ = cv2.connectedComponentsWithStats(seg_bin, connectivity=8)
+        if n <= 1:
+            return None
+        k = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        bx, by, bw, bh = (int(v) for v in stats[k, :4])
+        comp = (labels[by:by + bh, bx:bx + bw] == k).view(np.uint8)
+        # unit top-left in image coords; findContours adds the offset to every point
         r, idx = self.img_widget.grid_rects[row]
         ux, uy = int(r[0]), int(r[1])
+        cnts, _ = cv2.findContours(comp, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE, offset=(ux + bx, uy + by))
+        if not cnts:
+            return None
+        # build QPainterPath in IMAGE coordinates
+        path = QtGui.QPainterPath()
         for ci, c in enumerate(cnts):
             try:
                 pts = c.reshape(-1, 2)
@@ -2605,17 +3143,10 @@ class MainWindow(QtWidgets.QMainWindow):
                 continue
             if pts.size == 0:
                 continue
-            # first point
-            p0x = int(ux + int(pts[0][0]))
-            p0y = int(uy + int(pts[0][1]))
-            path.moveTo(p0x, p0y)
-            for pi in range(1, pts.shape[0]):
-                px = int(ux + int(pts[pi][0]))
-                py = int(uy + int(pts[pi][1]))
-                path.lineTo(px, py)
+            # hand Qt one polygon instead of a lineTo() per point
+            path.addPolygon(QtGui.QPolygonF([QtCore.QPointF(px, py) for px, py in pts.tolist()]))
             path.closeSubpath()
-        self.img_widget.erosion_path = path
-        self.img_widget.update()
+        return path
 
     def img_widget_zoom(self, factor: float):
         # apply zoom multiplier to ImageWidget
@@ -2669,34 +3200,32 @@ class MainWindow(QtWidgets.QMainWindow):
     def _segmask_to_object_binary(self, seg_arr):
         # Normalize a segmentation mask array to a single-object binary mask (0/255 uint8).
         # This handles masks that might be inverted or contain background as the largest component.
-        try:
-            bw = (seg_arr > 0).astype(np.uint8) * 255
+        def _largest_filled(bin_mask):
+            # largest region with its holes filled (same as the largest filled external contour),
+            # found with one labelling pass instead of contour tracing
+            filled = segmentation.fill_internal_holes(bin_mask)
+            nlab, labels, stats, _ = cv2.connectedComponentsWithStats(filled, connectivity=8)
+            if nlab <= 1:
+                return None, 0
+            areas = stats[1:, cv2.CC_STAT_AREA]
+            best = 1 + int(np.argmax(areas))
+            return np.multiply(labels == best, 255, dtype=np.uint8), int(areas[best - 1])
+
+        try:
+            bw = segmentation.binarize(seg_arr)
             h_m, w_m = bw.shape
             area_total = h_m * w_m
-            cnts, _ = cv2.findContours(bw.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if not cnts:
+            largest, largest_area = _largest_filled(bw)
+            if largest is None:
                 return np.zeros_like(bw)
-            # find largest contour and its area
-            largest = max(cnts, key=cv2.contourArea)
-            largest_area = cv2.contourArea(largest)
-            # if the largest contour covers most of the crop, it's likely background => invert
+            # if the largest region covers most of the crop, it's likely background => invert
             if largest_area >= 0.5 * area_total:
                 # invert mask and find largest object in inverted space
-                inv = ((bw == 0).astype(np.uint8) * 255)
-                cnts2, _ = cv2.findContours(inv.copy(), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                if cnts2:
-                    best = max(cnts2, key=cv2.contourArea)
-                    mask = np.zeros_like(bw)
-                    cv2.drawContours(mask, [best], -1, 255, -1)
-                    return mask
-                else:
-                    # nothing found in inverted mask; fall back to bw
-                    return bw
-            else:
-                # largest is likely the object; return its filled contour
-                mask = np.zeros_like(bw)
-                cv2.drawContours(mask, [largest], -1, 255, -1)
-                return mask
+                best, _ = _largest_filled(cv2.bitwise_not(bw))
+                # nothing found in inverted mask; fall back to bw
+                return best if best is not None else bw
+            # largest is likely the object; return it filled
+            return largest
         except Exception:
             return (seg_arr > 0).astype(np.uint8) * 255
 
@@ -2708,6 +3237,7 @@ class MainWindow(QtWidgets.QMainWindow):
         if not dirpath:
             return
         csv_rows = []
+        jobs = []
         for i in range(self.thumb_list.count()):
             item = self.thumb_list.item(i)
             pm_mask = item.data(ROLE_BASE + 1)
@@ -2715,35 +3245,61 @@ class MainWindow(QtWidgets.QMainWindow):
                 continue
             fname = f'mask_{i:04d}.png'
             full = os.path.join(dirpath, fname)
-            pm_mask.save(full)
-            # compute stats from saved mask using cv2
-            img = cv2.imread(full, cv2.IMREAD_GRAYSCALE)
+            # stats straight from the in-memory mask (no save + imread round-trip)
+            img, owner = segmentation.qimage_to_gray_view(pm_mask.toImage())
             stats = segmentation.mask_stats(img)
+            jobs.append((full, img, owner))
             csv_rows.append({'index': i, 'mask': fname, 'area': stats['area'], 'centroid_x': stats['centroid'][0], 'centroid_y': stats['centroid'][1]})
+        if getattr(self, 'zip_masks_btn', None) is not None and self.zip_masks_btn.isChecked():
+            # encode in parallel, then append to one stored archive: one file open instead of N
+            encoded = list(self._worker_pool().map(lambda job: _encode_png(job[1]), jobs))
+            failed = encoded.count(None)
+            try:
+                with zipfile.ZipFile(os.path.join(dirpath, 'masks.zip'), 'w', zipfile.ZIP_STORED) as zf:
+                    for (full, _img, _owner), data in zip(jobs, encoded):
+                        if data is not None:
+                            zf.writestr(os.path.basename(full), data)
+            except Exception as e:
+                self.log(f'Mask export: failed to write masks.zip: {e}')
+                failed = len(jobs)
+        else:
+            # encode the PNGs in parallel (cv2 releases the GIL)
+            ok = list(self._worker_pool().map(lambda job: _write_png(job[0], job[1]), jobs))
+            failed = ok.count(False)
+        if failed:
+            self.log(f'Mask export: failed to write {failed} file(s)')
         # write CSV
         csv_path = os.path.join(dirpath, 'masks_summary.csv')
         with open(csv_path, 'w', newline='') as cf:
             writer = csv.DictWriter(cf, fieldnames=['index', 'mask', 'area', 'centroid_x', 'centroid_y'])
             writer.writeheader()
-            for row in csv_rows:
-                writer.writerow(row)
-        QtWidgets.QMessageBox.information(self, 'Saved', f'Exported {len(csv_rows)} masks + summary to {dirpath}')
-
-    def export_grid(self):
-        if not self.img_widget.grid_rects:
-            QtWidgets.QMessageBox.information(self, 'Info', 'No grid to export. Apply indexing first.')
-            return
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save grid JSON', 'grid.json', 'JSON (*.json)')
-        if not path:
-            return
-        boxes = []
-        for r, idx in self.img_widget.grid_rects:
-            # r is tuple (x,y,w,h)
-            boxes.append({'index': idx, 'x': int(r[0]), 'y': int(r[1]), 'w': int(r[2]), 'h': int(r[3])})
-        # metadata to allow deterministic import later
+            # one call: the row loop runs inside the C csv writer
+            writer.writerows(csv_rows)
+        if failed:
+            QtWidgets.QMessageBox.warning(
+                self, 'Saved with errors',
+                f'Exported {len(jobs) - failed} of {len(jobs)} masks + summary to {dirpath}\n\n'
+                f'{failed} mask(s) could not be written.'
+            )
+        else:
+            QtWidgets.QMessageBox.information(self, 'Saved', f'Exported {len(jobs)} masks + summary to {dirpath}')
+
+    def _grid_boxes(self):
+        # box dicts for JSON/MessagePack export, built from the widget's (N, 4) int32 grid array:
+        # one tolist() yields plain ints for every cell instead of four int() calls per box
+        self.img_widget._sync_grid_arrays()
+        return [
+            {'index': idx, 'x': x, 'y': y, 'w': w, 'h': h}
+            for (x, y, w, h), (_, idx) in zip(self.img_widget.grid_img.tolist(), self.img_widget.grid_rects)
+        ]
+
+    def _grid_metadata(self):
+        # grid/layout metadata shared by the grid and combined exports (image looked up once)
+        img = self.img_widget.image
+        iw, ih = (img.width(), img.height()) if img else (None, None)
         meta = {
-            'image_width': self.img_widget.image.width() if self.img_widget.image else None,
-            'image_height': self.img_widget.image.height() if self.img_widget.image else None,
+            'image_width': iw,
+            'image_height': ih,
             'units_x': self.units_x.value(),
             'units_y': self.units_y.value(),
             'blocks_x': self.blocks_x.value(),
@@ -2754,9 +3310,21 @@ class MainWindow(QtWidgets.QMainWindow):
             'block_space_y': self.block_space_y.value(),
         }
         # base unit
-        if self.img_widget.fixed_img_rect:
-            fir = self.img_widget.fixed_img_rect
+        fir = self.img_widget.fixed_img_rect
+        if fir:
             meta['base_unit'] = {'x': int(fir.x()), 'y': int(fir.y()), 'w': int(fir.width()), 'h': int(fir.height())}
+        return meta
+
+    def export_grid(self):
+        if not self.img_widget.grid_rects:
+            QtWidgets.QMessageBox.information(self, 'Info', 'No grid to export. Apply indexing first.')
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save grid JSON', 'grid.json', 'JSON (*.json)')
+        if not path:
+            return
+        boxes = self._grid_boxes()
+        # metadata to allow deterministic import later
+        meta = self._grid_metadata()
         # include exclusions + alignment anchors (XY shift relative to segmentation centroid)
         ref_centroids = {}
         try:
@@ -2779,54 +3347,112 @@ class MainWindow(QtWidgets.QMainWindow):
             },
         }
         with open(path, 'w') as f:
-            json.dump(exports, f, indent=2)
+            f.write(_json_dumps(exports, indent=True))
         QtWidgets.QMessageBox.information(self, 'Saved', f'Wrote {len(boxes)} boxes + metadata to {path}')
 
     def export_combined_json(self):
         if not self.img_widget.grid_rects:
             QtWidgets.QMessageBox.information(self, 'Info', 'No grid to export. Apply indexing first.')
             return
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save combined JSON (with embedded masks)', 'grid_with_masks.json', 'JSON (*.json)')
+        filters = 'JSON (*.json)' + (';;MessagePack (*.mpk)' if msgpack is not None else '')
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save combined JSON (with embedded masks)', 'grid_with_masks.json', filters)
         if not path:
             return
-        boxes = []
-        for r, idx in self.img_widget.grid_rects:
-            boxes.append({'index': idx, 'x': int(r[0]), 'y': int(r[1]), 'w': int(r[2]), 'h': int(r[3])})
-        meta = {
-            'image_width': self.img_widget.image.width() if self.img_widget.image else None,
-            'image_height': self.img_widget.image.height() if self.img_widget.image else None,
-            'units_x': self.units_x.value(),
-            'units_y': self.units_y.value(),
-            'blocks_x': self.blocks_x.value(),
-            'blocks_y': self.blocks_y.value(),
-            'unit_space_x': self.unit_space_x.value(),
-            'unit_space_y': self.unit_space_y.value(),
-            'block_space_x': self.block_space_x.value(),
-            'block_space_y': self.block_space_y.value(),
-        }
-        if self.img_widget.fixed_img_rect:
-            fir = self.img_widget.fixed_img_rect
-            meta['base_unit'] = {'x': int(fir.x()), 'y': int(fir.y()), 'w': int(fir.width()), 'h': int(fir.height())}
+        boxes = self._grid_boxes()
+        meta = self._grid_metadata()
+        if path.lower().endswith('.mpk') and msgpack is not None:
+            self._export_combined_msgpack(path, meta, boxes)
+            return
+
+        # Stream the document: same JSON as json.dump({'metadata', 'boxes', 'exclusions', 'masks'}),
+        # but masks are written one by one instead of first collecting every encoded mask in a list.
+        n_masks = 0
+        try:
+            with open(path, 'w') as f:
+                f.write('{"metadata": ')
+                f.write(_json_dumps(meta))
+                f.write(', "boxes": ')
+                f.write(_json_dumps(boxes))
+                f.write(', "exclusions": ')
+                f.write(_json_dumps(getattr(self, 'exclusions', [])))
+                f.write(', "masks": [')
+                # collect masks from thumbnails (UserRole+1)
+                for i in range(self.thumb_list.count()):
+                    item = self.thumb_list.item(i)
+                    pm_mask = item.data(ROLE_BASE + 1)
+                    if not isinstance(pm_mask, QtGui.QPixmap):
+                        continue
+                    if n_masks:
+                        f.write(', ')
+                    f.write(f'{{"index": {i}, "mask_b64": "')
+                    f.write(base64.b64encode(self._mask_png_bytes(item, pm_mask)).decode('ascii'))
+                    f.write('"}')
+                    n_masks += 1
+                f.write(']}')
+            QtWidgets.QMessageBox.information(self, 'Saved', f'Wrote combined JSON with {n_masks} embedded masks to {path}')
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, 'Error', f'Failed to write JSON: {e}')
+
+    def _mask_png_bytes(self, item, pm_mask: QtGui.QPixmap) -> bytes:
+        # PNG encoding of a mask pixmap, reused while the pixmap is unchanged (same cacheKey)
+        key = pm_mask.cacheKey()
+        cached = item.data(ROLE_BASE + 10)
+        if isinstance(cached, (tuple, list)) and len(cached) == 2 and cached[0] == key:
+            return cached[1]
+        qim = pm_mask.toImage()
+        # one QBuffer for every encode (GUI thread only): reopening WriteOnly truncates it, and the
+        # underlying QByteArray keeps its capacity, so repeat exports don't reallocate per mask
+        buf = getattr(self, '_png_buffer', None)
+        if buf is None:
+            buf = QtCore.QBuffer()
+            self._png_buffer = buf
+        buf.open(QtCore.QIODevice.OpenModeFlag.WriteOnly | QtCore.QIODevice.OpenModeFlag.Truncate)
+        try:
+            qim.save(buf, 'PNG', PNG_QT_QUALITY)
+            raw = bytes(buf.data())
+        finally:
+            buf.close()
+        item.setData(ROLE_BASE + 10, (key, raw))
+        return raw
+
+    def _export_combined_msgpack(self, path: str, meta: dict, boxes: list):
+        # Same document as export_combined_json, but masks are raw PNG bytes ('png') in msgpack bin fields.
         masks_out = []
-        # collect masks from thumbnails (UserRole+1)
         for i in range(self.thumb_list.count()):
             item = self.thumb_list.item(i)
             pm_mask = item.data(ROLE_BASE + 1)
             if isinstance(pm_mask, QtGui.QPixmap):
-                qim = pm_mask.toImage()
-                buf = QtCore.QBuffer()
-                buf.open(QtCore.QIODevice.OpenModeFlag.WriteOnly)
-                qim.save(buf, 'PNG')
-                raw = bytes(buf.data())
-                b64 = base64.b64encode(raw).decode('ascii')
-                masks_out.append({'index': i, 'mask_b64': b64})
+                masks_out.append({'index': i, 'png': self._mask_png_bytes(item, pm_mask)})
         exports = {'metadata': meta, 'boxes': boxes, 'exclusions': getattr(self, 'exclusions', []), 'masks': masks_out}
         try:
-            with open(path, 'w') as f:
-                json.dump(exports, f)
-            QtWidgets.QMessageBox.information(self, 'Saved', f'Wrote combined JSON with {len(masks_out)} embedded masks to {path}')
+            with open(path, 'wb') as f:
+                f.write(msgpack.packb(exports, use_bin_type=True))
+            QtWidgets.QMessageBox.information(self, 'Saved', f'Wrote combined MessagePack with {len(masks_out)} embedded masks to {path}')
         except Exception as e:
-            QtWidgets.QMessageBox.critical(self, 'Error', f'Failed to write JSON: {e}')
+            QtWidgets.QMessageBox.critical(self, 'Error', f'Failed to write MessagePack: {e}')
+
+    def _parse_boxes(self, boxes):
+        # box dicts -> [((x, y, w, h), index), ...]; a missing index becomes the position in the grid
+        try:
+            # fast path: one numpy conversion for all coordinates, one tolist() back to plain ints
+            xywh = np.array([(b['x'], b['y'], b['w'], b['h']) for b in boxes], dtype=np.int64).reshape(-1, 4).tolist()
+            idxs = [b.get('index', None) for b in boxes]
+        except Exception:
+            xywh = None
+        if xywh is not None:
+            return [(tuple(r), i if idx is None else idx) for i, (r, idx) in enumerate(zip(xywh, idxs))]
+        # slow path for malformed files: skip the boxes that don't parse
+        grid = []
+        for item in boxes or []:
+            try:
+                idx = item.get('index', None)
+                x = int(item['x']); y = int(item['y']); w = int(item['w']); h = int(item['h'])
+            except Exception:
+                continue
+            if idx is None:
+                idx = len(grid)
+            grid.append(((x, y, w, h), idx))
+        return grid
 
     def import_grid(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Open grid JSON', '.', 'JSON (*.json)')
@@ -2836,12 +3462,10 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.information(self, 'Info', 'Load an image first before importing a grid.')
             return
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            data = _json_load_file(path)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, 'Error', f'Failed to read JSON: {e}')
             return
-        grid = []
         # support two formats: legacy list-of-boxes or new dict with 'boxes' and 'metadata'
         boxes = None
         if isinstance(data, dict) and 'boxes' in data:
@@ -2878,15 +3502,7 @@ class MainWindow(QtWidgets.QMainWindow):
             boxes = []
             meta = {}
 
-        for item in boxes:
-            try:
-                idx = item.get('index', None)
-                x = int(item['x']); y = int(item['y']); w = int(item['w']); h = int(item['h'])
-            except Exception:
-                continue
-            if idx is None:
-                idx = len(grid)
-            grid.append(((x, y, w, h), idx))
+        grid = self._parse_boxes(boxes)
         if not grid:
             QtWidgets.QMessageBox.information(self, 'Info', 'No valid boxes found in JSON.')
             return
@@ -2917,6 +3533,8 @@ class MainWindow(QtWidgets.QMainWindow):
                     self.img_widget.fixed_img_rect = QtCore.QRect(int(bu.get('x', 0)), int(bu.get('y', 0)), int(bu.get('w', 1)), int(bu.get('h', 1)))
         except Exception:
             pass
+        # the imported boxes are authoritative; drop the preview queued by the spinbox updates above
+        self._grid_preview_timer.stop()
         self.img_widget.update()
         self.populate_thumbnails()
 
@@ -2936,12 +3554,18 @@ class MainWindow(QtWidgets.QMainWindow):
     def import_mask(self):
         # Import a JSON that may contain metadata/boxes/exclusions and embedded masks (base64) or mask file references,
         # or select a folder next to a JSON that contains mask_XXXX.png files.
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Open mask JSON (or a JSON next to mask files)', '.', 'JSON (*.json);;All Files (*)')
+        filters = 'JSON (*.json);;' + ('MessagePack (*.mpk);;' if msgpack is not None else '') + 'All Files (*)'
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Open mask JSON (or a JSON next to mask files)', '.', filters)
         if not path:
             return
         try:
-            with open(path, 'r') as f:
-                data = json.load(f)
+            if path.lower().endswith('.mpk'):
+                if msgpack is None:
+                    raise RuntimeError('msgpack is not installed')
+                with open(path, 'rb') as f:
+                    data = msgpack.unpackb(f.read(), raw=False)
+            else:
+                data = _json_load_file(path)
         except Exception as e:
             QtWidgets.QMessageBox.critical(self, 'Error', f'Failed to read JSON: {e}')
             return
@@ -2968,16 +3592,7 @@ class MainWindow(QtWidgets.QMainWindow):
             boxes = None
 
         if boxes:
-            grid = []
-            for item in boxes:
-                try:
-                    idx = item.get('index', None)
-                    x = int(item['x']); y = int(item['y']); w = int(item['w']); h = int(item['h'])
-                except Exception:
-                    continue
-                if idx is None:
-                    idx = len(grid)
-                grid.append(((x, y, w, h), idx))
+            grid = self._parse_boxes(boxes)
             if not grid:
                 QtWidgets.QMessageBox.information(self, 'Info', 'No valid boxes found in JSON.')
                 return
@@ -2999,65 +3614,53 @@ class MainWindow(QtWidgets.QMainWindow):
                         self.img_widget.fixed_img_rect = QtCore.QRect(int(bu.get('x', 0)), int(bu.get('y', 0)), int(bu.get('w', 1)), int(bu.get('h', 1)))
             except Exception:
                 pass
+            # the imported boxes are authoritative; drop the preview queued by the spinbox updates above
+            self._grid_preview_timer.stop()
             self.populate_thumbnails()
 
             # load masks embedded in JSON (base64) or referenced files
             masks_list = data.get('masks', []) if isinstance(data, dict) else []
             json_dir = os.path.dirname(path)
-            if masks_list:
-                for m in masks_list:
-                    try:
-                        idx = int(m.get('index', -1))
-                        if idx < 0 or idx >= self.thumb_list.count():
+            with self._thumb_list_batch(data_only=True):
+                if masks_list:
+                    for m in masks_list:
+                        try:
+                            idx = int(m.get('index', -1))
+                            if idx < 0 or idx >= self.thumb_list.count():
+                                continue
+                            pm_mask = None
+                            raw_png = None
+                            if 'png' in m:
+                                raw_png = bytes(m['png'])
+                            elif 'mask_b64' in m:
+                                raw_png = base64.b64decode(m['mask_b64'])
+                            if raw_png is not None:
+                                qim = QtGui.QImage.fromData(raw_png)
+                                if not qim.isNull():
+                                    pm_mask = QtGui.QPixmap.fromImage(qim)
+                                else:
+                                    raw_png = None
+                            elif 'mask_file' in m:
+                                mf = m['mask_file']
+                                if not os.path.isabs(mf):
+                                    mf = os.path.join(json_dir, mf)
+                                if os.path.exists(mf):
+                                    base_pm = self.thumb_list.item(idx).data(ROLE_BASE)
+                                    pm_mask = self._load_mask_as_pixmap(mf, base_pm.size() if base_pm else None)
+                            if pm_mask:
+                                item = self.thumb_list.item(idx)
+                                item.setData(ROLE_BASE + 1, pm_mask)
+                                if raw_png is not None:
+                                    # the embedded PNG is already an encoding of this mask: re-export it as-is
+                                    item.setData(ROLE_BASE + 10, (pm_mask.cacheKey(), raw_png))
+                        except Exception:
                             continue
-                        pm_mask = None
-                        if 'mask_b64' in m:
-                            b = base64.b64decode(m['mask_b64'])
-                            qim = QtGui.QImage.fromData(b)
-                            if not qim.isNull():
-                                pm_mask = QtGui.QPixmap.fromImage(qim)
-                        elif 'mask_file' in m:
-                            mf = m['mask_file']
-                            if not os.path.isabs(mf):
-                                mf = os.path.join(json_dir, mf)
-                            if os.path.exists(mf):
-                                pm_mask = QtGui.QPixmap(mf)
-                        if pm_mask:
-                            item = self.thumb_list.item(idx)
-                            item.setData(ROLE_BASE + 1, pm_mask)
-                            thumb_pm = item.data(ROLE_BASE)
-                            if isinstance(thumb_pm, QtGui.QPixmap):
-                                overlay = self._make_overlay_pixmap(
-                                    thumb_pm,
-                                    pm_mask.scaled(
-                                        thumb_pm.size(),
-                                        QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                                        QtCore.Qt.TransformationMode.SmoothTransformation,
-                                    ),
-                                )
-                                item.setIcon(QtGui.QIcon(overlay))
-                    except Exception:
-                        continue
-            else:
-                # also try reading mask_####.png files next to JSON
-                for i in range(self.thumb_list.count()):
-                    f = os.path.join(json_dir, f'mask_{i:04d}.png')
-                    if os.path.exists(f):
-                        pm = QtGui.QPixmap(f)
-                        item = self.thumb_list.item(i)
-                        item.setData(ROLE_BASE + 1, pm)
-                        thumb_pm = item.data(ROLE_BASE)
-                        if isinstance(thumb_pm, QtGui.QPixmap):
-                            overlay = self._make_overlay_pixmap(
-                                thumb_pm,
-                                pm.scaled(
-                                    thumb_pm.size(),
-                                    QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                                    QtCore.Qt.TransformationMode.SmoothTransformation,
-                                ),
-                            )
-                            item.setIcon(QtGui.QIcon(overlay))
+                else:
+                    # also try reading mask_####.png files (or masks.zip) next to JSON
+                    self._load_masks_from_dir(json_dir)
 
+            # overlays for all units at once
+            self.refresh_canvas_overlays()
             # refresh selected overlay if needed
             if self.img_widget.selected_cell_index is not None:
                 self.update_selected_overlay(self.img_widget.selected_cell_index)
@@ -3065,54 +3668,69 @@ class MainWindow(QtWidgets.QMainWindow):
             return
 
         # Fallback: if JSON didn't contain boxes, try loading a folder of masks (user selects folder)
-        dirpath = QtWidgets.QFileDialog.getExistingDirectory(self, 'Select folder containing mask_XXXX.png files', os.path.dirname(path))
+        dirpath = QtWidgets.QFileDialog.getExistingDirectory(self, 'Select folder containing mask_XXXX.png files or masks.zip', os.path.dirname(path))
         if not dirpath:
             QtWidgets.QMessageBox.information(self, 'Info', 'No boxes or masks found in JSON and no folder selected.')
             return
         # try to load mask files into existing thumbnails
-        loaded = 0
-        for i in range(self.thumb_list.count()):
-            f = os.path.join(dirpath, f'mask_{i:04d}.png')
-            if os.path.exists(f):
-                pm = QtGui.QPixmap(f)
-                item = self.thumb_list.item(i)
-                item.setData(ROLE_BASE + 1, pm)
-                thumb_pm = item.data(ROLE_BASE)
-                if isinstance(thumb_pm, QtGui.QPixmap):
-                    overlay = self._make_overlay_pixmap(
-                        thumb_pm,
-                        pm.scaled(
-                            thumb_pm.size(),
-                            QtCore.Qt.AspectRatioMode.IgnoreAspectRatio,
-                            QtCore.Qt.TransformationMode.SmoothTransformation,
-                        ),
-                    )
-                    item.setIcon(QtGui.QIcon(overlay))
-                loaded += 1
+        with self._thumb_list_batch(data_only=True):
+            loaded = self._load_masks_from_dir(dirpath)
+        self.refresh_canvas_overlays()
         QtWidgets.QMessageBox.information(self, 'Imported', f'Loaded {loaded} masks from {dirpath}')
         if self.img_widget.selected_cell_index is not None:
             self.update_selected_overlay(self.img_widget.selected_cell_index)
 
+    def _load_masks_from_dir(self, dirpath):
+        # load mask_XXXX.png for every unit from dirpath/masks.zip if present, else from loose files;
+        # returns the number of masks loaded
+        loaded = 0
+        zf = None
+        zip_path = os.path.join(dirpath, 'masks.zip')
+        if os.path.exists(zip_path):
+            try:
+                zf = zipfile.ZipFile(zip_path, 'r')
+            except Exception:
+                zf = None
+        try:
+            names = set(zf.namelist()) if zf is not None else None
+            for i in range(self.thumb_list.count()):
+                fname = f'mask_{i:04d}.png'
+                f = os.path.join(dirpath, fname)
+                if names is not None:
+                    if fname not in names:
+                        continue
+                    data = zf.read(fname)
+                elif os.path.exists(f):
+                    data = None
+                else:
+                    continue
+                item = self.thumb_list.item(i)
+                base_pm = item.data(ROLE_BASE)
+                pm = self._load_mask_as_pixmap(f, base_pm.size() if base_pm else None, data=data)
+                if pm:
+                    item.setData(ROLE_BASE + 1, pm)
+                    loaded += 1
+        finally:
+            if zf is not None:
+                zf.close()
+        return loaded
+
     def populate_thumbnails(self):
         self.thumb_list.clear()
         if not self.img_widget.grid_rects or not self.img_widget.image:
             return
-        base = QtGui.QPixmap.fromImage(self.img_widget.image)
-        for r, idx in self.img_widget.grid_rects:
-            # r is (x,y,w,h)
-            sub = base.copy(int(r[0]), int(r[1]), int(r[2]), int(r[3]))
-            icon = QtGui.QIcon(
-                sub.scaled(
-                    128,
-                    128,
-                    QtCore.Qt.AspectRatioMode.KeepAspectRatio,
-                    QtCore.Qt.TransformationMode.SmoothTransformation,
-                )
-            )
-            item = QtWidgets.QListWidgetItem(icon, str(idx))
-            # store pixmap for export
-            item.setData(ROLE_BASE, sub)
-            self.thumb_list.addItem(item)
+        # unit pixmaps are cut from the source QImage (no full-image QPixmap conversion just to copy cells out
+        # of it); the list is only a data store, so items carry no icons
+        with self._thumb_list_batch():
+            for r, idx in self.img_widget.grid_rects:
+                # r is (x,y,w,h)
+                x, y, w, h = int(r[0]), int(r[1]), int(r[2]), int(r[3])
+                # cell copy in the source format (1 byte/pixel for gray images), converted per cell
+                sub = QtGui.QPixmap.fromImage(self.img_widget.image.copy(x, y, w, h))
+                item = QtWidgets.QListWidgetItem(str(idx))
+                # store pixmap for export
+                item.setData(ROLE_BASE, sub)
+                self.thumb_list.addItem(item)
         # update defect unit spin range if present
         if hasattr(self, 'defect_unit_spin'):
             n = max(0, self.thumb_list.count() - 1)
@@ -3131,13 +3749,31 @@ class MainWindow(QtWidgets.QMainWindow):
         dirpath = QtWidgets.QFileDialog.getExistingDirectory(self, 'Select folder to save thumbnails', '.')
         if not dirpath:
             return
+        # grab RGB views on the GUI thread, then encode PNGs in parallel (cv2 releases the GIL)
+        jobs = []
         for i in range(self.thumb_list.count()):
             item = self.thumb_list.item(i)
             pm = item.data(ROLE_BASE)
             if isinstance(pm, QtGui.QPixmap):
                 fname = f"unit_{i:04d}.png"
-                pm.save(QtCore.QDir.cleanPath(QtCore.QDir(dirpath).filePath(fname)))
-        QtWidgets.QMessageBox.information(self, 'Saved', f'Exported {self.thumb_list.count()} thumbnails to {dirpath}')
+                rgb, owner = segmentation.qimage_to_rgb_view(pm.toImage())
+                jobs.append((QtCore.QDir.cleanPath(QtCore.QDir(dirpath).filePath(fname)), rgb, owner))
+
+        def _write(job):
+            fpath, rgb, _owner = job
+            return _write_png(fpath, cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+
+        ok = list(self._worker_pool().map(_write, jobs))
+        failed = ok.count(False)
+        if failed:
+            self.log(f'Thumbnail export: failed to write {failed} file(s)')
+            QtWidgets.QMessageBox.warning(
+                self, 'Saved with errors',
+                f'Exported {len(jobs) - failed} of {len(jobs)} thumbnails to {dirpath}\n\n'
+                f'{failed} thumbnail(s) could not be written.'
+            )
+            return
+        QtWidgets.QMessageBox.information(self, 'Saved', f'Exported {len(jobs)} thumbnails to {dirpath}')
 
 
 class ModifyExclusionDialog(QtWidgets.QDialog):
@@ -1,3 +1,6 @@
+import functools
+import math
+
 import cv2
 import numpy as np
 
@@ -6,22 +9,114 @@ try:
 except Exception:
     QImage = None
 
+# Optional: numba fuses the defect residual/threshold/ROI passes into one loop.
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
 
 def qimage_to_gray_array(qimg):
-    # convert QImage to grayscale numpy array
-    # PyQt6 requires QImage.Format enum (PyQt5 historically allowed int values)
+    # convert QImage to an owning grayscale numpy array (same conversion as qimage_to_gray_view)
     if QImage is None:
         raise RuntimeError("PyQt6 is required for qimage_to_gray_array() in improved_UI")
-    qimg = qimg.convertToFormat(QImage.Format.Format_ARGB32)
-    ptr = qimg.bits()
-    byte_count = getattr(qimg, "sizeInBytes", None)
-    byte_count = byte_count() if callable(byte_count) else qimg.byteCount()
-    ptr.setsize(int(byte_count))
-    arr = np.frombuffer(ptr, np.uint8).reshape((qimg.height(), qimg.width(), 4))
-    # ARGB -> convert to BGR order
-    bgr = arr[:, :, :3][:, :, ::-1]
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
-    return gray
+    view, _owner = qimage_to_gray_view(qimg)
+    return np.array(view)
+
+
+def qimage_to_gray_view(qimg):
+    """Return a grayscale numpy view of a QImage, zero-copy for Format_Grayscale8 images.
+
+    Other formats are converted with OpenCV's luma weights (cv2.COLOR_RGB2GRAY), not Qt's
+    Grayscale8 conversion, so every caller sees the same gray values for colour images.
+    The returned array may share memory with an image, so that backing object is returned
+    too and must be kept alive while the view is in use.
+
+    Args:
+        qimg: QImage of any format.
+
+    Returns:
+        (view, owner) where `view` is a (h, w) uint8 array and `owner` is the object backing it.
+    """
+    if QImage is None:
+        raise RuntimeError("PyQt6 is required for qimage_to_gray_view()")
+    if qimg.format() != QImage.Format.Format_Grayscale8:
+        rgb, _rgb_owner = qimage_to_rgb_view(qimg)
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        return gray, gray
+    h, w = qimg.height(), qimg.width()
+    bpl = qimg.bytesPerLine()
+    ptr = qimg.constBits()
+    ptr.setsize(int(qimg.sizeInBytes()))
+    # rows are padded to 4 bytes; view with the real stride and drop the padding columns
+    arr = np.frombuffer(ptr, np.uint8).reshape((h, bpl))[:, :w]
+    return arr, qimg
+
+
+def qimage_to_rgb_view(qimg):
+    """Return a zero-copy (h, w, 3) RGB numpy view of a QImage.
+
+    Same contract as qimage_to_gray_view(): the image is converted to Format_RGB888 only if
+    needed, and the backing QImage is returned and must be kept alive while the view is used.
+
+    Args:
+        qimg: QImage of any format.
+
+    Returns:
+        (view, owner) where `view` is a (h, w, 3) uint8 array and `owner` is the QImage backing it.
+    """
+    if QImage is None:
+        raise RuntimeError("PyQt6 is required for qimage_to_rgb_view()")
+    if qimg.format() != QImage.Format.Format_RGB888:
+        qimg = qimg.convertToFormat(QImage.Format.Format_RGB888)
+    h, w = qimg.height(), qimg.width()
+    bpl = qimg.bytesPerLine()
+    ptr = qimg.constBits()
+    ptr.setsize(int(qimg.sizeInBytes()))
+    arr = np.frombuffer(ptr, np.uint8).reshape((h, bpl))[:, :w * 3].reshape((h, w, 3))
+    return arr, qimg
+
+
+def binarize(mask: np.ndarray) -> np.ndarray:
+    """Return a uint8 0/255 copy of a uint8 mask (>0 becomes 255) in a single OpenCV pass."""
+    _, out = cv2.threshold(mask, 0, 255, cv2.THRESH_BINARY)
+    return out
+
+
+@functools.lru_cache(maxsize=64)
+def _erosion_kernel(px: int):
+    # (2px+1)^2 square: one pass equals `px` iterations of cv2's default 3x3 kernel
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (2 * px + 1, 2 * px + 1))
+
+
+@functools.lru_cache(maxsize=32)
+def _ellipse_kernel(k: int):
+    # shared k x k elliptical structuring element (segmentation cleanup, defect noise opening)
+    return cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (k, k))
+
+
+def erode_mask(mask: np.ndarray, px: int) -> np.ndarray:
+    """Shrink a binary mask inward by `px` pixels.
+
+    Equivalent to ``cv2.erode(mask, None, iterations=px)`` but done in a single pass: a cached
+    square kernel for small radii, and a chessboard distance transform for large ones.
+
+    Args:
+        mask: uint8 mask (0/255).
+        px: erosion radius in pixels; <= 0 returns the mask unchanged.
+
+    Returns:
+        The eroded uint8 mask (0/255).
+    """
+    px = int(px)
+    if px <= 0:
+        return mask
+    if px > 15:
+        # chessboard distance to the nearest background pixel; O(1) per pixel regardless of radius
+        dist = cv2.distanceTransform(mask, cv2.DIST_C, 3)
+        _, out = cv2.threshold(dist, px, 255, cv2.THRESH_BINARY)
+        return out.astype(np.uint8)
+    return cv2.erode(mask, _erosion_kernel(px))
 
 
 def fill_internal_holes(mask: np.ndarray) -> np.ndarray:
@@ -46,28 +141,16 @@ def fill_internal_holes(mask: np.ndarray) -> np.ndarray:
     if h == 0 or w == 0:
         return m
 
-    inv = cv2.bitwise_not(m)
-    flood = inv.copy()
-    ff_mask = np.zeros((h + 2, w + 2), dtype=np.uint8)
-
     # Fill the exterior/background in the inverted image.
     # IMPORTANT: do NOT assume (0,0) is background because unit crops can be fully inside the mold surface.
-    # Instead, flood-fill from every border pixel that is background in the original mask (255 in inv).
-    def _try_seed(x: int, y: int):
-        if flood[y, x] == 255:
-            cv2.floodFill(flood, ff_mask, (x, y), 0)
-
-    # Top and bottom rows
-    for x in range(w):
-        _try_seed(x, 0)
-        _try_seed(x, h - 1)
-    # Left and right columns
-    for y in range(h):
-        _try_seed(0, y)
-        _try_seed(w - 1, y)
-
-    # Remaining 255s in `flood` correspond to holes.
-    holes = flood
+    # Instead, pad with a 1px background ring: it touches every border pixel that is background in the
+    # original mask, so a single flood fill from the ring reaches all of them.
+    inv = cv2.bitwise_not(cv2.copyMakeBorder(m, 1, 1, 1, 1, cv2.BORDER_CONSTANT, value=0))
+    ff_mask = np.zeros((h + 4, w + 4), dtype=np.uint8)
+    cv2.floodFill(inv, ff_mask, (0, 0), 0)
+
+    # Remaining 255s in `inv` correspond to holes.
+    holes = inv[1:-1, 1:-1]
     filled = cv2.bitwise_or(m, holes)
     return filled
 
@@ -90,7 +173,7 @@ def segment_cell(gray, method='otsu', adapt_block=51, adapt_C=10, gaussian_blur=
     # morphology: close small holes, open small speckle
     if morph_kernel and morph_kernel > 0:
         k = max(1, int(morph_kernel))
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (k, k))
+        kernel = _ellipse_kernel(k)
         mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=1)
         mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
 
@@ -102,10 +185,246 @@ def segment_cell(gray, method='otsu', adapt_block=51, adapt_C=10, gaussian_blur=
 
 def mask_stats(mask):
     # mask: uint8 0/255
-    ys, xs = np.where(mask > 0)
-    if len(xs) == 0:
+    # binary image moments give the pixel count (m00) and coordinate sums (m10, m01) in one C pass,
+    # without materializing the coordinate arrays of every foreground pixel
+    m = cv2.moments(mask, binaryImage=True)
+    area = int(round(m['m00']))
+    if area == 0:
         return {'area': 0, 'centroid': (0, 0)}
-    area = int(len(xs))
-    cx = float(xs.mean())
-    cy = float(ys.mean())
+    cx = float(m['m10'] / m['m00'])
+    cy = float(m['m01'] / m['m00'])
     return {'area': area, 'centroid': (cx, cy)}
+
+
+if njit is not None:
+    # serial kernels: units are already spread over the UI's worker pool, and parallel numba kernels
+    # launched from several pool threads oversubscribe the cores (and can hang the TBB layer at exit).
+    # nogil lets the pool threads actually run them side by side.
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _residual_mask_kernel(gray, bg, seg_bin, thr, out):
+        h, w = gray.shape
+        for i in range(h):
+            for j in range(w):
+                # signed: uint8 - uint8 would wrap and flag every pixel darker than its background
+                d = np.int16(gray[i, j]) - np.int16(bg[i, j])
+                if d < 0:
+                    d = -d
+                out[i, j] = 255 if (d > thr and seg_bin[i, j] != 0) else 0
+
+    @njit(cache=True, nogil=True)
+    def _box_residual_kernel(gray, seg_bin, thr, k, out):
+        # k x k replicate-border box mean (via an integral image), residual, threshold and ROI in one pass
+        h, w = gray.shape
+        p = k // 2
+        hp = h + 2 * p
+        wp = w + 2 * p
+        integ = np.zeros((hp + 1, wp + 1), dtype=np.int64)
+        for i in range(hp):
+            si = min(max(i - p, 0), h - 1)
+            run = 0
+            for j in range(wp):
+                sj = min(max(j - p, 0), w - 1)
+                run += gray[si, sj]
+                integ[i + 1, j + 1] = integ[i, j + 1] + run
+        area = k * k
+        for i in range(h):
+            for j in range(w):
+                if seg_bin[i, j] == 0:
+                    out[i, j] = 0
+                    continue
+                s = integ[i + k, j + k] - integ[i, j + k] - integ[i + k, j] + integ[i, j]
+                # rounded mean, as cv2.boxFilter (k*k is odd, so there are no .5 ties)
+                bg = (2 * s + area) // (2 * area)
+                d = int(gray[i, j]) - bg
+                if d < 0:
+                    d = -d
+                out[i, j] = 255 if d > thr else 0
+else:
+    _residual_mask_kernel = None
+    _box_residual_kernel = None
+
+
+def residual_anomaly_mask(gray, bg, thr, seg_bin=None):
+    """Threshold the absolute difference between `gray` and a background estimate.
+
+    Pixels where |gray - bg| > thr become 255; if `seg_bin` is given, pixels outside it are 0.
+    Uses a fused numba kernel when numba is installed, otherwise the equivalent OpenCV passes.
+
+    Args:
+        gray: uint8 2D image.
+        bg: uint8 2D background estimate (same shape as `gray`), e.g. a median blur.
+        thr: residual threshold (0..255).
+        seg_bin: optional uint8 ROI mask (0/255).
+
+    Returns:
+        A uint8 mask (0/255).
+    """
+    if _residual_mask_kernel is not None and seg_bin is not None:
+        out = np.empty(gray.shape, dtype=np.uint8)
+        _residual_mask_kernel(gray, bg, seg_bin, int(thr), out)
+        return out
+    resid = cv2.absdiff(gray, bg)
+    _, mask = cv2.threshold(resid, thr, 255, cv2.THRESH_BINARY)
+    if seg_bin is not None:
+        mask = cv2.bitwise_and(mask, seg_bin)
+    return mask
+
+
+def box_residual_mask(gray, thr, seg_bin=None, k=21):
+    """residual_anomaly_mask() against a k x k box-mean background, fused when numba is available.
+
+    Equivalent to residual_anomaly_mask(gray, estimate_background(gray, k, 'box'), thr, seg_bin),
+    but with numba the background is never materialized and `gray` is read once.
+    """
+    if k % 2 == 0:
+        k += 1
+    if _box_residual_kernel is not None and seg_bin is not None:
+        out = np.empty(gray.shape, dtype=np.uint8)
+        _box_residual_kernel(np.ascontiguousarray(gray), seg_bin, int(thr), int(k), out)
+        return out
+    return residual_anomaly_mask(gray, estimate_background(gray, k, 'box'), thr, seg_bin)
+
+
+def estimate_background(gray: np.ndarray, k: int = 21, method: str = 'box') -> np.ndarray:
+    """Low-pass background estimate of a uint8 image for residual defect detection.
+
+    'box' is a separable k x k mean (constant time per pixel); 'median' is the slower,
+    outlier-robust k x k median. Both replicate the border.
+    """
+    if k % 2 == 0:
+        k += 1
+    if method == 'median':
+        return cv2.medianBlur(gray, k)
+    return cv2.boxFilter(gray, -1, (k, k), borderType=cv2.BORDER_REPLICATE)
+
+
+def estimate_background_batch(grays, k: int = 21, method: str = 'box'):
+    """estimate_background() for many unit images with a single filter call.
+
+    Units are tiled into one atlas, each surrounded by a k//2 replicated margin, so the filter
+    window never crosses into a neighbour and every result equals estimate_background() on
+    that unit alone.
+
+    Returns:
+        list of uint8 arrays (views into the filtered atlas), one per input image.
+    """
+    if k % 2 == 0:
+        k += 1
+    if not grays:
+        return []
+    p = k // 2
+    slot_h = max(g.shape[0] for g in grays) + 2 * p
+    slot_w = max(g.shape[1] for g in grays) + 2 * p
+    cols = int(math.ceil(math.sqrt(len(grays))))
+    rows = int(math.ceil(len(grays) / cols))
+    atlas = np.zeros((rows * slot_h, cols * slot_w), dtype=np.uint8)
+    origins = []
+    for i, g in enumerate(grays):
+        y0 = (i // cols) * slot_h
+        x0 = (i % cols) * slot_w
+        h, w = g.shape
+        if h > 0 and w > 0:
+            atlas[y0:y0 + h + 2 * p, x0:x0 + w + 2 * p] = cv2.copyMakeBorder(g, p, p, p, p, cv2.BORDER_REPLICATE)
+        origins.append((y0 + p, x0 + p, h, w))
+    bg = estimate_background(atlas, k, method)
+    return [bg[y:y + h, x:x + w] for y, x, h, w in origins]
+
+
+def detect_defects(gray, seg_arr=None, method='threshold', thr=24, min_area=20, erode_px=0, background='box',
+                   bg=None, log=None):
+    """Detect foreign material in a unit image, restricted to the segmentation ROI.
+
+    This is the whole per-unit pipeline on plain numpy arrays (no Qt objects), so it can be
+    called in a tight loop or from worker threads.
+
+    Args:
+        gray: uint8 2D unit image.
+        seg_arr: optional uint8 segmentation mask (same shape as `gray`); >0 is the ROI.
+        method: 'threshold' (local background residual) or 'canny'.
+        thr: detection threshold.
+        min_area: minimum accepted defect region area in pixels.
+        erode_px: shrink the ROI by this many pixels before detecting.
+        background: background estimator for 'threshold', 'box' (fast) or 'median' (see estimate_background).
+        bg: optional precomputed background for `gray` (e.g. from estimate_background_batch).
+        log: optional callable receiving diagnostic messages.
+
+    Returns:
+        (mask, area) where `mask` is a uint8 0/255 mask of accepted defect regions (None if nothing
+        was accepted) and `area` is its foreground pixel count.
+    """
+    def _dlog(msg: str):
+        if log is not None:
+            log(msg)
+
+    seg_bin = None
+    if seg_arr is not None:
+        # Use the segmentation mask exactly as the ROI (match what the Segmentation overlay shows)
+        seg_bin = binarize(seg_arr)
+        try:
+            seg_area0 = int(cv2.countNonZero(seg_bin))
+        except Exception:
+            seg_area0 = 0
+        _dlog(f'Seg mask area (roi)={seg_area0}, erode_px={erode_px}')
+        if erode_px > 0:
+            try:
+                seg_bin = erode_mask(seg_bin, erode_px)
+            except Exception:
+                pass
+        # Keep only the largest connected ROI component after erosion.
+        # IMPORTANT: do NOT use filled external contours here, because that would fill internal holes
+        # (including user exclusions). Use connected components so holes remain holes.
+        try:
+            nlab, labels, stats, _ = cv2.connectedComponentsWithStats(seg_bin, connectivity=8)
+            if nlab > 1:
+                # skip background label 0
+                areas = stats[1:, cv2.CC_STAT_AREA]
+                best = 1 + int(np.argmax(areas))
+                seg_bin = np.multiply(labels == best, 255, dtype=np.uint8)
+        except Exception:
+            pass
+        # if segmentation mask is empty after normalization/erosion, skip detection
+        if seg_bin is None or cv2.countNonZero(seg_bin) == 0:
+            _dlog('Segmentation mask empty after erode — skipping detection for this unit')
+            return None, 0
+
+    if method == 'threshold':
+        # Local anomaly detection: threshold the absolute difference from a local background.
+        # This is much more stable than a global gray threshold for spotting foreign material.
+        if bg is None and background == 'box':
+            mask = box_residual_mask(gray, thr, seg_bin, 21)
+        else:
+            if bg is None:
+                bg = estimate_background(gray, 21, background)
+            mask = residual_anomaly_mask(gray, bg, thr, seg_bin)
+        # clean small pepper noise
+        try:
+            mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, _ellipse_kernel(3), iterations=1)
+        except Exception:
+            pass
+        _dlog(f'Residual mask area={int(cv2.countNonZero(mask))}')
+    else:
+        mask = cv2.Canny(gray, max(1, thr // 2), max(2, thr))
+        if seg_bin is not None:
+            mask = cv2.bitwise_and(mask, seg_bin)
+    # allow very large defects, but reject "whole part" masks (shouldn't happen often with residual-based mask)
+    try:
+        seg_area = int(cv2.countNonZero(seg_bin)) if seg_bin is not None else int(gray.shape[0] * gray.shape[1])
+    except Exception:
+        seg_area = int(gray.shape[0] * gray.shape[1])
+    max_area = max(min_area, int(seg_area * 0.98))
+    _dlog(f'Defect area filter: min={min_area}, max={max_area}, seg_area={seg_area}')
+    # Regions are accepted by the area of their external contour (so open edge chains, e.g. from Canny,
+    # have ~0 area and are dropped) and drawn filled; the reported area is the filled pixel count.
+    cnts, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    kept = []
+    for c in cnts:
+        a = cv2.contourArea(c)
+        if min_area <= a <= max_area:
+            kept.append(c)
+        elif a >= min_area:
+            _dlog(f'Skipping large contour area={int(a)} (>max={max_area})')
+    if not kept:
+        return None, 0
+    mask2 = np.zeros_like(mask)
+    cv2.drawContours(mask2, kept, -1, 255, -1)
+    return mask2, int(cv2.countNonZero(mask2))
@@ -0,0 +1,68 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import segmentation  # noqa: E402
+
+
+def _cv2_residual_mask(gray, bg, thr, seg_bin):
+    resid = cv2.absdiff(gray, bg)
+    _, mask = cv2.threshold(resid, thr, 255, cv2.THRESH_BINARY)
+    return cv2.bitwise_and(mask, seg_bin)
+
+
+@pytest.fixture
+def unit():
+    rng = np.random.default_rng(0)
+    gray = rng.integers(0, 256, size=(64, 80), dtype=np.uint8)
+    seg_bin = np.zeros_like(gray)
+    seg_bin[4:60, 6:74] = 255
+    return gray, seg_bin
+
+
+@pytest.mark.skipif(segmentation._residual_mask_kernel is None, reason='numba not installed')
+@pytest.mark.parametrize('thr', [0, 10, 24, 200])
+def test_residual_kernel_matches_absdiff(unit, thr):
+    gray, seg_bin = unit
+    # background both darker and brighter than the image, so negative residuals are exercised
+    bg = np.random.default_rng(1).integers(0, 256, size=gray.shape, dtype=np.uint8)
+    assert (gray < bg).any() and (gray > bg).any()
+    got = segmentation.residual_anomaly_mask(gray, bg, thr, seg_bin)
+    np.testing.assert_array_equal(got, _cv2_residual_mask(gray, bg, thr, seg_bin))
+
+
+@pytest.mark.skipif(segmentation._box_residual_kernel is None, reason='numba not installed')
+@pytest.mark.parametrize('thr', [0, 10, 24])
+def test_box_residual_kernel_matches_absdiff(unit, thr):
+    gray, seg_bin = unit
+    bg = segmentation.estimate_background(gray, 21, 'box')
+    got = segmentation.box_residual_mask(gray, thr, seg_bin, 21)
+    np.testing.assert_array_equal(got, _cv2_residual_mask(gray, bg, thr, seg_bin))
+
+
+@pytest.mark.skipif(segmentation._box_residual_kernel is None, reason='numba not installed')
+def test_kernels_run_concurrently_from_pool(unit):
+    # the UI runs one detect_defects job per unit on a thread pool; the nogil kernels must give the same
+    # masks there as when called one after another
+    gray, seg_bin = unit
+    rng = np.random.default_rng(2)
+    grays = [rng.integers(0, 256, size=gray.shape, dtype=np.uint8) for _ in range(8)]
+    bg = segmentation.estimate_background(gray, 21, 'box')
+
+    def _job(i):
+        if i % 2:
+            return segmentation.box_residual_mask(grays[i], 24, seg_bin, 21)
+        return segmentation.residual_anomaly_mask(grays[i], bg, 24, seg_bin)
+
+    expected = [_job(i) for i in range(len(grays))]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        got = list(pool.map(_job, range(len(grays))))
+    for e, g in zip(expected, got):
+        np.testing.assert_array_equal(g, e)